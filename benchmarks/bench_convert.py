@@ -0,0 +1,119 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+import os
+import re
+import shutil
+import tempfile
+
+from harness import Skip, benchmark
+
+## a local trans file, e.g. src/exfor_dictionary/trans_backup/trans.9128
+TRANS_FILE = os.environ.get("EXFOR_BENCH_TRANS")
+
+
+def _scratch(convert_dictionary):
+    """
+    scratch copy of the data directory with TRANS_FILE in trans_backup,
+    convert_dictionary is pointed at it until _cleanup
+    """
+    work = tempfile.TemporaryDirectory(prefix="exfor-bench-")
+    for d in ["trans_backup/dictions", "trans_json/dictions"]:
+        os.makedirs(os.path.join(work.name, d))
+    shutil.copy(TRANS_FILE, os.path.join(work.name, "trans_backup", os.path.basename(TRANS_FILE)))
+    return {
+        "module": convert_dictionary,
+        "work": work,
+        "path": convert_dictionary.DICTIONARY_PATH,
+        "trans_num": re.split(r"\.", os.path.basename(TRANS_FILE))[1],
+    }
+
+
+def _cleanup(context):
+    context["module"].DICTIONARY_PATH = context["path"]
+    context["work"].cleanup()
+
+
+def _conversion():
+    ## runs in a scratch copy of the data directory, nothing is downloaded
+    if not TRANS_FILE or not os.path.exists(TRANS_FILE):
+        raise Skip("set EXFOR_BENCH_TRANS to a local trans.NNNN file")
+    try:
+        from exfor_dictionary import convert_dictionary
+    except ImportError as e:
+        raise Skip("conversion dependencies missing: %s" % e)
+
+    context = _scratch(convert_dictionary)
+    try:
+        convert_dictionary.DICTIONARY_PATH = context["work"].name
+        convert_dictionary.parse_dictionary(context["trans_num"])
+    except BaseException:
+        _cleanup(context)
+        raise
+    return context
+
+
+@benchmark(
+    "convert.conv_dictionary_to_json",
+    setup=_conversion,
+    teardown=_cleanup,
+    repeat=3,
+    min_time=0,
+)
+def _conv_dictionary_to_json(context):
+    context["module"].DICTIONARY_PATH = context["work"].name
+    context["module"].conv_dictionary_to_json(context["trans_num"])
+
+
+def _compressed(compression):
+    ## TRANS_FILE stored as trans_backup/trans.N[.gz|.xz|.zst] in a scratch directory
+    def setup():
+        if not TRANS_FILE or not os.path.exists(TRANS_FILE):
+            raise Skip("set EXFOR_BENCH_TRANS to a local trans.NNNN file")
+        from exfor_dictionary import convert_dictionary
+
+        context = _scratch(convert_dictionary)
+        work, trans_num = context["work"].name, context["trans_num"]
+        try:
+            convert_dictionary.DICTIONARY_PATH = work
+            with convert_dictionary.open_trans(trans_num) as f:
+                content = f.read().encode()
+            for file in os.listdir(os.path.join(work, "trans_backup")):
+                if file.startswith("trans."):
+                    os.remove(os.path.join(work, "trans_backup", file))
+            convert_dictionary.write_trans(trans_num, content, compression)
+        except ImportError as e:
+            _cleanup(context)
+            raise Skip(str(e))
+        except BaseException:
+            _cleanup(context)
+            raise
+        return context
+
+    return setup
+
+
+def _parse_dictionary(context):
+    convert_dictionary, trans_num = context["module"], context["trans_num"]
+    ## the module is shared by the setups, point it at this one's directory
+    convert_dictionary.DICTIONARY_PATH = context["work"].name
+    convert_dictionary.get_diction_difinition(trans_num)
+    convert_dictionary.parse_dictionary(trans_num)
+
+
+for _compression in [None, "gz", "xz", "zst"]:
+    benchmark(
+        "convert.parse_dictionary[%s]" % (_compression or "plain"),
+        setup=_compressed(_compression),
+        teardown=_cleanup,
+        repeat=3,
+    )(_parse_dictionary)
@@ -0,0 +1,160 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+from harness import Skip, benchmark
+
+from exfor_dictionary.exfor_dictionary import Diction
+from exfor_dictionary.abbreviations import (
+    convert_abbreviations,
+    head_unit_abbr,
+    institute_abbr,
+    reaction_abbr,
+)
+
+HEADS_GETTERS = [
+    "get_incident_en_heads",
+    "get_incident_en_err_heads",
+    "get_data_heads",
+    "get_data_err_heads",
+    "get_outgoing_e_heads",
+    "get_outgoing_e_err_heads",
+    "get_level_heads",
+    "get_angle_heads",
+    "get_angle_err_heads",
+    "get_mass_heads",
+    "get_elem_heads",
+]
+
+## getter -> DICTION it resolves codes of
+CODE_GETTERS = {
+    "get_institute": "3",
+    "get_reftype": "4",
+    "get_journal": "5",
+    "get_report": "6",
+    "get_confproceeding": "7",
+    "get_method": "21",
+    "get_detectors": "22",
+    "get_facility": "18",
+    "get_err_analysis": "24",
+    "get_inc_sources": "19",
+}
+
+SAMPLE = 100
+
+
+def _diction():
+    return Diction()
+
+
+def _sample_codes(diction_num):
+    def setup():
+        d = Diction()
+        ## the getters strip parentheses, so codes containing them cannot be resolved
+        codes = [c for c in d.dictionaries[diction_num]["codes"] if "(" not in c]
+        step = max(1, len(codes) // SAMPLE)
+        ## in the parenthesised form found in EXFOR entries
+        return d, ["(" + c + ")" for c in codes[::step][:SAMPLE]]
+
+    return setup
+
+
+benchmark("load.diction", min_time=1.0)(lambda _: Diction())
+
+
+for _getter in HEADS_GETTERS:
+    benchmark("heads." + _getter, setup=_diction)(
+        lambda d, getter=_getter: getattr(d, getter)()
+    )
+
+
+def _units():
+    d = Diction()
+    units = [u for u in d.dictionaries["25"]["codes"]][:SAMPLE]
+    return d, units
+
+
+@benchmark("units.get_unit_factor x100", setup=_units)
+def _get_unit_factor(context):
+    d, units = context
+    for u in units:
+        d.get_unit_factor(u)
+
+
+def _unit_pairs():
+    d = Diction()
+    graph = d.get_unit_graph()
+    pairs = [
+        (a, b)
+        for units in graph.units.values()
+        for a in units
+        for b in units
+    ]
+    return d, pairs[:SAMPLE]
+
+
+@benchmark("units.get_conversion_factor x100", setup=_unit_pairs)
+def _get_conversion_factor(context):
+    d, pairs = context
+    for a, b in pairs:
+        d.get_conversion_factor(a, b)
+
+
+def _tables():
+    d = Diction()
+    headings = ["EN", "EN-ERR", "ANG", "DATA", "DATA-ERR"]
+    units = ["MEV", "KEV", "ADEG", "MB/SR", "PER-CENT"]
+    return d, headings, units
+
+
+@benchmark("units.resolve_table cached", setup=_tables)
+def _resolve_table(context):
+    d, headings, units = context
+    d.resolve_table(headings, units)
+
+
+def _unit_array():
+    try:
+        import numpy
+    except ImportError:
+        raise Skip("numpy is not installed")
+    return Diction(), numpy.linspace(1.0, 2.0e4, 100000)
+
+
+@benchmark("units.convert_units 1e5 values", setup=_unit_array)
+def _convert_units(context):
+    d, values = context
+    d.convert_units(values, "KEV", "MEV")
+
+
+for _getter, _num in CODE_GETTERS.items():
+    def _run(context, getter=_getter):
+        d, codes = context
+        fn = getattr(d, getter)
+        for c in codes:
+            fn(c)
+
+    benchmark("codes.%s x%d" % (_getter, SAMPLE), setup=_sample_codes(_num))(_run)
+
+
+def _descriptions():
+    d = Diction()
+    return [
+        (abbr, r["description"])
+        for num, abbr in [("3", institute_abbr), ("24", head_unit_abbr), ("236", reaction_abbr)]
+        for r in list(d.dictionaries[num]["codes"].values())[:SAMPLE]
+    ]
+
+
+@benchmark("abbreviations.convert_abbreviations x300", setup=_descriptions)
+def _convert_abbreviations(descriptions):
+    for abbr, desc in descriptions:
+        convert_abbreviations(abbr, desc)
@@ -0,0 +1,85 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+Task dispatch overhead of a process pool when every task gets the dictionary.
+
+    python benchmarks/dispatch.py [--tasks 2000] [--workers 4] [--save dispatch.json]
+
+"tree" sends the dictionaries tree with each task, as pickling a Diction
+did before it was reduced to a reference; "diction" sends the Diction
+itself, which the workers reattach to their shared copy.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+from exfor_dictionary.exfor_dictionary import Diction
+
+
+def task_tree(dictionaries, code):
+    return dictionaries["3"]["codes"][code]["description"]
+
+
+def task_diction(diction, code):
+    return diction.get_institute(code)
+
+
+def dispatch(pool, task, payload, codes):
+    start = time.perf_counter()
+    for _ in pool.map(task, [payload] * len(codes), codes, chunksize=1):
+        pass
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--save")
+    args = parser.parse_args(argv)
+
+    d = Diction()
+    codes = [c for c in d.dictionaries["3"]["codes"] if "(" not in c]
+    codes = (codes * (args.tasks // len(codes) + 1))[: args.tasks]
+
+    results = {}
+    with ProcessPoolExecutor(args.workers) as pool:
+        ## start the workers and let them load their copy before timing
+        list(pool.map(task_diction, [d] * args.workers, codes[: args.workers]))
+        for mode, task, payload in [
+            ("tree", task_tree, d.dictionaries),
+            ("diction", task_diction, d),
+        ]:
+            seconds = dispatch(pool, task, payload, codes)
+            results[mode] = {
+                "pickle_bytes": len(pickle.dumps(payload)),
+                "tasks_per_second": len(codes) / seconds,
+            }
+            print("%-8s %9d bytes/task %10.0f tasks/s" % (
+                mode, results[mode]["pickle_bytes"], results[mode]["tasks_per_second"]
+            ))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
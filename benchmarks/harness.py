@@ -0,0 +1,95 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+import gc
+import statistics
+import time
+
+BENCHMARKS = {}
+
+
+class Skip(Exception):
+    ## raised from a setup when the benchmark cannot run here
+    pass
+
+
+def benchmark(name, setup=None, repeat=5, min_time=0.2, unit="s", teardown=None):
+    """
+    register fn(context) as benchmark name; setup() runs once and
+    returns the context, fn is looped until one repeat takes min_time,
+    teardown(context) runs at the end also when fn fails
+    """
+
+    def register(fn):
+        BENCHMARKS[name] = {
+            "fn": fn,
+            "setup": setup,
+            "teardown": teardown,
+            "repeat": repeat,
+            "min_time": min_time,
+            "unit": unit,
+        }
+        return fn
+
+    return register
+
+
+def _calibrate(fn, context, min_time):
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(context)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            return number
+        number *= 10 if elapsed < min_time / 10 else 2
+
+
+def run_benchmark(name):
+    """
+    return {"min", "median", "stdev", "number", "repeat"} in seconds per call,
+    or {"skipped": reason}
+    """
+    spec = BENCHMARKS[name]
+    try:
+        context = spec["setup"]() if spec["setup"] else None
+    except Skip as e:
+        return {"skipped": str(e)}
+
+    fn = spec["fn"]
+    times = []
+    try:
+        number = _calibrate(fn, context, spec["min_time"])
+
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(spec["repeat"]):
+                start = time.perf_counter()
+                for _ in range(number):
+                    fn(context)
+                times.append((time.perf_counter() - start) / number)
+        finally:
+            if gc_enabled:
+                gc.enable()
+    finally:
+        if spec["teardown"]:
+            spec["teardown"](context)
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "number": number,
+        "repeat": spec["repeat"],
+    }
@@ -0,0 +1,98 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+Import time of the package modules, from python -X importtime.
+
+    python benchmarks/importtime.py [--runs 7] [--save importtime.json]
+
+Each module is imported in a fresh interpreter; the cumulative time of
+the module itself and the third-party packages it pulled in are reported.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(os.path.dirname(HERE), "src")
+
+MODULES = [
+    "exfor_dictionary",
+    "exfor_dictionary.exfor_dictionary",
+    "exfor_dictionary.convert_dictionary",
+    "exfor_dictionary.geoinfo",
+]
+
+HEAVY = ("pandas", "numpy", "requests", "bs4")
+
+
+def import_once(module):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        env=env,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+    )
+    cumulative = None
+    heavy = set()
+    for line in proc.stderr.decode().splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = [f.strip() for f in line[len("import time:"):].split("|")]
+        if name == module:
+            cumulative = int(cum)
+        if name.split(".")[0] in HEAVY:
+            heavy.add(name.split(".")[0])
+    if proc.returncode != 0:
+        return None, heavy
+    return cumulative, heavy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--save")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for module in MODULES:
+        times = []
+        heavy = set()
+        for _ in range(args.runs):
+            us, pulled = import_once(module)
+            heavy |= pulled
+            if us is not None:
+                times.append(us)
+        if not times:
+            results[module] = {"error": "import failed"}
+            print("%-40s import failed" % module)
+            continue
+        results[module] = {
+            "median_us": statistics.median(times),
+            "min_us": min(times),
+            "third_party": sorted(heavy),
+        }
+        print("%-40s %8.1f ms  %s" % (
+            module, statistics.median(times) / 1000, ", ".join(sorted(heavy)) or "stdlib only"
+        ))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+Record decoding throughput in lines/s: the string slicing the converter
+used before vs the compiled layouts of exfor_dictionary.layouts.
+
+    EXFOR_BENCH_TRANS=src/exfor_dictionary/trans_backup/trans.9128 python benchmarks/layouts.py
+
+The trans file is split into DICTION blocks in a scratch directory and
+the records of the DICTIONs with a plain, parenthesised or unit layout
+are decoded into {code: (description, ..., active)} both ways; the
+results must be equal.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+from exfor_dictionary import convert_dictionary
+from exfor_dictionary.convert_dictionary import skip_unused_lines
+from exfor_dictionary.layouts import ACTIVE, LAYOUTS, PARENTHESISED, PLAIN
+
+PARENTHESISED_DICTIONS = [209, 207, 33, 23, 22, 21, 20, 19, 18, 17, 16, 15, 8, 7, 5, 4, 3, 2]
+PLAIN_DICTIONS = [144, 43, 38, 35, 34, 32, 31, 30, 6, 1]
+
+
+def slicing(diction_num, diction):
+    ## the loops of conv_dictionary_to_json before the layouts
+    codes = {}
+    if int(diction_num) in PARENTHESISED_DICTIONS:
+        for d in diction:
+            if skip_unused_lines(d):
+                continue
+            if not d.startswith(" "):
+                x4code = d[:11].rstrip()
+                desc = re.match(r"\((.*)\)", d[11:66]).group(1)
+                flag = d[79:80]
+                if int(diction_num) == 5:
+                    journal_contry = d[62:66]
+                    codes[x4code] = (desc, journal_contry, False if flag == "O" or flag == "X" else True)
+                else:
+                    codes[x4code] = (desc, False if flag == "O" or flag == "X" else True)
+
+    elif int(diction_num) in PLAIN_DICTIONS:
+        for d in diction:
+            skip_unused_lines(d)
+            if not d.startswith(" "):
+                x4code = d[:11].rstrip()
+                desc = d[11:66].rstrip()
+                flag = d[79:80]
+                if int(diction_num) == 6:
+                    report_inst = d[59:66]
+                    codes[x4code] = (desc[:-7].rstrip(), report_inst, False if flag == "O" or flag == "X" else True)
+                else:
+                    codes[x4code] = (desc, False if flag == "O" or flag == "X" else True)
+
+    elif int(diction_num) == 25:
+        for d in diction[1:]:
+            if d[0].isalpha() or d[0].isdigit():
+                flag = d[79:80]
+                x4code = d[:11].rstrip()
+                desc = d[11:44].rstrip()
+                additional_code = d[44:55].rstrip()
+                factor = d[55:66].strip()
+                codes[x4code] = (desc, additional_code, factor, False if flag == "O" or flag == "X" else True)
+    return codes
+
+
+def layout(diction_num, diction):
+    codes = {}
+    num = int(diction_num)
+    if num in PARENTHESISED_DICTIONS:
+        decode = LAYOUTS[5].decode if num == 5 else PARENTHESISED.decode
+        regex = re.compile(r"\((.*)\)")
+        for d in diction:
+            if skip_unused_lines(d):
+                continue
+            if not d.startswith(" "):
+                if num == 5:
+                    x4code, desc, flag, journal_contry = decode(d)
+                else:
+                    x4code, desc, flag = decode(d)
+                desc = regex.match(desc).group(1)
+                if num == 5:
+                    codes[x4code.rstrip()] = (desc, journal_contry, ACTIVE.get(flag, True))
+                else:
+                    codes[x4code.rstrip()] = (desc, ACTIVE.get(flag, True))
+
+    elif num in PLAIN_DICTIONS:
+        decode = LAYOUTS[6].decode if num == 6 else PLAIN.decode
+        for d in diction:
+            if not d.startswith(" "):
+                if num == 6:
+                    x4code, desc, flag, report_inst = decode(d)
+                else:
+                    x4code, desc, flag = decode(d)
+                desc = desc.rstrip()
+                if num == 6:
+                    codes[x4code.rstrip()] = (desc[:-7].rstrip(), report_inst, ACTIVE.get(flag, True))
+                else:
+                    codes[x4code.rstrip()] = (desc, ACTIVE.get(flag, True))
+
+    elif num == 25:
+        decode = LAYOUTS[25].decode
+        for d in diction[1:]:
+            if d[0].isalpha() or d[0].isdigit():
+                x4code, desc, additional_code, factor, flag = decode(d)
+                codes[x4code.rstrip()] = (
+                    desc.rstrip(), additional_code.rstrip(), factor.strip(), ACTIVE.get(flag, True)
+                )
+    return codes
+
+
+def measure(decode, blocks, min_time):
+    lines = sum(len(diction) for _, diction in blocks)
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        for diction_num, diction in blocks:
+            decode(diction_num, diction)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return lines * runs / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trans", default=os.environ.get("EXFOR_BENCH_TRANS"))
+    parser.add_argument("--min-time", type=float, default=2.0)
+    parser.add_argument("--save")
+    args = parser.parse_args(argv)
+    if not args.trans or not os.path.exists(args.trans):
+        sys.exit("set EXFOR_BENCH_TRANS or --trans to a local trans.NNNN file")
+
+    trans_num = re.split(r"\.", os.path.basename(args.trans))[1]
+    work = tempfile.mkdtemp(prefix="exfor-bench-")
+    try:
+        os.makedirs(os.path.join(work, "trans_backup", "dictions"))
+        shutil.copy(args.trans, os.path.join(work, "trans_backup", os.path.basename(args.trans)))
+        convert_dictionary.DICTIONARY_PATH = work
+        convert_dictionary.parse_dictionary(trans_num)
+
+        blocks = []
+        for num in PARENTHESISED_DICTIONS + PLAIN_DICTIONS + [25]:
+            file = os.path.join(work, "trans_backup", "dictions", "diction%d.dat" % num)
+            if os.path.exists(file):
+                with open(file) as f:
+                    blocks.append((str(num), f.read().splitlines()[1:]))
+    finally:
+        shutil.rmtree(work)
+
+    for diction_num, diction in blocks:
+        if slicing(diction_num, diction) != layout(diction_num, diction):
+            sys.exit("DICTION %s decodes differently" % diction_num)
+
+    results = {
+        "slicing": measure(slicing, blocks, args.min_time),
+        "layout": measure(layout, blocks, args.min_time),
+    }
+    for name, rate in results.items():
+        print("%-8s %12.0f lines/s" % (name, rate))
+    print("speed-up x%.2f" % (results["layout"] / results["slicing"]))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
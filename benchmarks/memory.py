@@ -0,0 +1,89 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+Memory per loaded version, plain dict records vs compact=True.
+
+    python benchmarks/memory.py [--versions 3] [--save memory.json]
+
+Each mode runs in a fresh interpreter that keeps several Diction
+instances resident, and reports the RSS growth and the traced Python
+allocations per version.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(os.path.dirname(HERE), "src")
+
+CHILD = r"""
+import gc, json, sys, tracemalloc
+
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * __import__("os").sysconf("SC_PAGE_SIZE")
+
+from exfor_dictionary.exfor_dictionary import Diction
+Diction()  # warm imports and caches
+gc.collect()
+compact, versions = sys.argv[1] == "1", int(sys.argv[2])
+before = rss()
+tracemalloc.start()
+kept = [Diction(compact=compact) for _ in range(versions)]
+gc.collect()
+traced = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+print(json.dumps({"rss_per_version": (rss() - before) / versions,
+                  "traced_per_version": traced / versions}))
+"""
+
+
+def measure(compact, versions):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, "1" if compact else "0", str(versions)],
+        env=env,
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+    return json.loads(out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--versions", type=int, default=3)
+    parser.add_argument("--save")
+    args = parser.parse_args(argv)
+
+    results = {
+        "dict": measure(False, args.versions),
+        "compact": measure(True, args.versions),
+    }
+    for mode, r in results.items():
+        print("%-8s rss %8.2f MB/version   traced %8.2f MB/version" % (
+            mode, r["rss_per_version"] / 2**20, r["traced_per_version"] / 2**20
+        ))
+    print("reduction: rss %.0f%%, traced %.0f%%" % (
+        100 * (1 - results["compact"]["rss_per_version"] / results["dict"]["rss_per_version"]),
+        100 * (1 - results["compact"]["traced_per_version"] / results["dict"]["traced_per_version"]),
+    ))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+Unique memory of forked workers, plain Diction vs preload() with gc.freeze.
+
+    python benchmarks/preload.py [--workers 4] [--save preload.json]
+
+Each mode runs in a fresh interpreter that loads the dictionary, forks
+workers which read every code record of the inherited Diction and run a full garbage collection,
+and reports the USS and PSS of each worker from /proc (Linux only).
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(os.path.dirname(HERE), "src")
+
+CHILD = r"""
+import gc, json, os, sys
+
+def smaps():
+    ## kB -> bytes, USS is the private part of the mapping
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    return {
+        "uss": values["Private_Clean"] + values["Private_Dirty"],
+        "pss": values["Pss"],
+    }
+
+import exfor_dictionary
+from exfor_dictionary.exfor_dictionary import Diction
+
+preloaded, workers = sys.argv[1] == "1", int(sys.argv[2])
+if preloaded:
+    d = exfor_dictionary.preload()[0]
+else:
+    d = Diction()
+    d.get_heading_roles(); d.get_search_index()
+    gc.collect()
+
+pipes = []
+for _ in range(workers):
+    r, w = os.pipe()
+    if os.fork() == 0:
+        os.close(r)
+        baseline = smaps()
+        for diction in d.dictionaries.values():
+            for code, record in diction["codes"].items():
+                record.get("description")
+        d.search("los alamos")
+        gc.collect()
+        after = smaps()
+        os.write(w, json.dumps({k: after[k] - baseline[k] for k in after}).encode())
+        os._exit(0)
+    os.close(w)
+    pipes.append(r)
+
+results = []
+for r in pipes:
+    with os.fdopen(r) as f:
+        results.append(json.loads(f.read()))
+    os.wait()
+print(json.dumps(results))
+"""
+
+
+def measure(preloaded, workers):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, "1" if preloaded else "0", str(workers)],
+        env=env,
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+    return json.loads(out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--save")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("preload.py needs /proc/self/smaps_rollup (Linux)")
+
+    results = {
+        "plain": measure(False, args.workers),
+        "preload": measure(True, args.workers),
+    }
+    for mode, workers in results.items():
+        uss = sum(w["uss"] for w in workers) / len(workers)
+        pss = sum(w["pss"] for w in workers) / len(workers)
+        print("%-8s USS growth %8.2f MB/worker   PSS growth %8.2f MB/worker" % (
+            mode, uss / 2**20, pss / 2**20
+        ))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+Offline benchmark suite.
+
+    python benchmarks/run.py                          run and print
+    python benchmarks/run.py -k heads                 only names containing "heads"
+    python benchmarks/run.py --save baseline.json     store a baseline
+    python benchmarks/run.py --compare baseline.json  fail on regressions
+
+A benchmark regresses when its min time exceeds the baseline min times
+the threshold of thresholds.json (per name, else "default").
+"""
+
+import argparse
+import glob
+import importlib
+import json
+import os
+import platform
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+from harness import BENCHMARKS, run_benchmark
+
+
+def load_benchmarks():
+    for file in sorted(glob.glob(os.path.join(HERE, "bench_*.py"))):
+        importlib.import_module(os.path.splitext(os.path.basename(file))[0])
+
+
+def load_thresholds():
+    with open(os.path.join(HERE, "thresholds.json")) as f:
+        return json.load(f)
+
+
+def compare(results, baseline, thresholds):
+    regressions = []
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if "min" not in result or not base or "min" not in base:
+            continue
+        limit = thresholds.get(name, thresholds["default"])
+        ratio = result["min"] / base["min"]
+        if ratio > limit:
+            regressions.append((name, ratio, limit))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="exfor_dictionary benchmarks")
+    parser.add_argument("-k", dest="match", default="", help="substring of names to run")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    args = parser.parse_args(argv)
+
+    load_benchmarks()
+    results = {}
+    for name in sorted(BENCHMARKS):
+        if args.match not in name:
+            continue
+        result = run_benchmark(name)
+        result["unit"] = BENCHMARKS[name]["unit"]
+        results[name] = result
+        if "skipped" in result:
+            print("%-45s skipped: %s" % (name, result["skipped"]))
+        else:
+            print("%-45s %12.3f us  (median %.3f us, n=%d)" % (
+                name, result["min"] * 1e6, result["median"] * 1e6, result["number"]
+            ))
+        sys.stdout.flush()
+
+    output = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(output, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, load_thresholds())
+        for name, ratio, limit in regressions:
+            print("REGRESSION %s: %.2fx baseline (threshold %.2fx)" % (name, ratio, limit))
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+Lookup throughput of one shared Diction from 1 to N threads.
+
+    python benchmarks/threads.py [--threads 1,2,4,8] [--seconds 2] [--save threads.json]
+
+Every thread resolves codes of DICTION 3, 5 and 25 and data-table
+headers in a loop. Before timing, all threads hit the lazy indexes of a
+fresh Diction at once and the script fails if any index was built more
+than once. On a GIL build the throughput is not expected to scale,
+the point is that it does not collapse; on a free-threaded build it
+should.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+from exfor_dictionary.exfor_dictionary import Diction, INDEXES
+
+TABLES = [
+    (("EN", "DATA", "DATA-ERR"), ("MEV", "MB", "PER-CENT")),
+    (("EN", "ANG", "DATA"), ("KEV", "ADEG", "MB/SR")),
+]
+
+
+def check_once_only(threads):
+    ## count builder calls while every thread asks for every index at the same time
+    d = Diction()
+    builds = {}
+    get_index = d._get_index
+
+    def counting(name, builder):
+        def build(dictionaries):
+            builds[name] = builds.get(name, 0) + 1
+            return builder(dictionaries)
+
+        return get_index(name, build)
+
+    d._get_index = counting
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        for build in INDEXES.values():
+            build(d)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    twice = {name: n for name, n in builds.items() if n > 1}
+    if twice:
+        raise SystemExit("indexes built more than once: %s" % twice)
+
+
+def lookups(d):
+    codes = [
+        (getter, code)
+        for getter, num in [
+            (d.get_institute, "3"),
+            (d.get_journal, "5"),
+            (d.get_unit_factor, "25"),
+        ]
+        for code in list(d.dictionaries[num]["codes"])[:200]
+        if "(" not in code
+    ]
+
+    def run():
+        for getter, code in codes:
+            getter(code)
+        for headings, units in TABLES:
+            d.resolve_table(headings, units)
+        return len(codes) + len(TABLES)
+
+    return run
+
+
+def throughput(d, threads, seconds):
+    run = lookups(d)
+    counts = [0] * threads
+    stop = threading.Event()
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(i):
+        barrier.wait()
+        while not stop.is_set():
+            counts[i] += run()
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    time.sleep(seconds)
+    stop.set()
+    for t in pool:
+        t.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", default="1,2,4,8")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--save")
+    args = parser.parse_args(argv)
+    counts = [int(n) for n in args.threads.split(",")]
+
+    check_once_only(max(counts))
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("python %s, GIL %s" % (sys.version.split()[0], "enabled" if gil else "disabled"))
+
+    d = Diction()
+    results = {}
+    for n in counts:
+        results[n] = throughput(d, n, args.seconds)
+        print("%3d threads %12.0f lookups/s   x%.2f" % (n, results[n], results[n] / results[counts[0]]))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"gil": gil, "lookups_per_second": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+
+def __getattr__(name):
+    ## loaded on first use, "import exfor_dictionary" stays cheap
+    if name == "preload":
+        from .exfor_dictionary import preload
+
+        return preload
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
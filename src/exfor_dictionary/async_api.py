@@ -0,0 +1,154 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+Async counterparts of the update functions in convert_dictionary.
+They do not print or exit: results are returned as dicts and failures
+are raised as exceptions from exfor_dictionary.exceptions. HTTP goes
+through aiohttp (the optional "async" extra), file I/O and the
+conversion itself run in the default executor. With EXFOR_MIRROR_PATH
+or a file:// source the trans files are read as by the sync update,
+in the executor and without aiohttp.
+"""
+
+import asyncio
+import functools
+
+from .config import DICTIONARY_URL, MIRROR_PATH
+from .exceptions import (
+    DictionaryServerError,
+    DictionaryVersionError,
+    TransFileNotFound,
+)
+
+
+async def _to_thread(func, *args, **kwargs):
+    ## asyncio.to_thread is not available on python 3.8
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+def _client_session():
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError(
+            "aiohttp is required for the async API, install exfor_dictionary[async]"
+        )
+    return aiohttp.ClientSession(raise_for_status=False)
+
+
+async def _get(session, url):
+    import aiohttp
+
+    try:
+        async with session.get(url, allow_redirects=True) as r:
+            if r.status == 404:
+                raise TransFileNotFound("%s not found on the server" % url)
+            if r.status >= 400:
+                raise DictionaryServerError("%s returned HTTP %d" % (url, r.status))
+            return await r.read()
+    except aiohttp.ClientError as e:
+        raise DictionaryServerError("%s: %s" % (url, e)) from e
+
+
+def _offline():
+    ## trans files from the mirror or a local source, as in convert_dictionary
+    from .mirror import local_path
+
+    return bool(MIRROR_PATH) or local_path(DICTIONARY_URL) is not None
+
+
+async def get_server_trans_nums_async(session=None):
+    from .convert_dictionary import parse_server_trans_nums
+
+    if _offline():
+        from .mirror import mirrored_trans_nums, source_trans_nums
+
+        if MIRROR_PATH:
+            trans_nums = await _to_thread(mirrored_trans_nums, MIRROR_PATH)
+        else:
+            trans_nums = await _to_thread(source_trans_nums, DICTIONARY_URL)
+        return ["9000"] + trans_nums
+
+    if session is None:
+        async with _client_session() as session:
+            return await get_server_trans_nums_async(session)
+
+    html = await _get(session, DICTIONARY_URL)
+    return parse_server_trans_nums(html.decode("utf-8", "replace"))
+
+
+async def download_trans_async(transnum, session=None):
+    """
+    download trans.<transnum> into trans_backup, compressed as set by
+    TRANS_COMPRESSION, return the file name
+    """
+    from .convert_dictionary import write_trans
+
+    if _offline():
+        from .mirror import fetch_trans, read_source
+
+        if MIRROR_PATH:
+            content = await _to_thread(fetch_trans, transnum, MIRROR_PATH, DICTIONARY_URL)
+        else:
+            content = await _to_thread(read_source, DICTIONARY_URL + "trans." + str(transnum))
+        return await _to_thread(write_trans, transnum, content)
+
+    if session is None:
+        async with _client_session() as session:
+            return await download_trans_async(transnum, session)
+
+    content = await _get(session, "".join([DICTIONARY_URL, "trans.", str(transnum)]))
+    return await _to_thread(write_trans, transnum, content)
+
+
+async def download_latest_dict_async(session=None):
+    """
+    return {"trans_num": latest, "downloaded": bool}
+    raise DictionaryVersionError if the local trans file is newer
+    """
+    from .convert_dictionary import get_latest_trans_num, get_local_trans_nums
+
+    if session is None and not _offline():
+        async with _client_session() as session:
+            return await download_latest_dict_async(session)
+
+    local_max = get_latest_trans_num(await _to_thread(get_local_trans_nums))
+    remote_max = get_latest_trans_num(await get_server_trans_nums_async(session))
+
+    if local_max == remote_max:
+        return {"trans_num": local_max, "downloaded": False}
+
+    elif local_max > remote_max:
+        raise DictionaryVersionError(local_max, remote_max)
+
+    await download_trans_async(remote_max, session)
+    return {"trans_num": remote_max, "downloaded": True}
+
+
+async def update_dictionary_to_latest_async(session=None):
+    """
+    return {"trans_num": latest, "downloaded": bool}
+    the conversion to json runs in a worker thread
+    """
+    from .convert_dictionary import conv_dictionary_to_json, parse_dictionary
+
+    result = await download_latest_dict_async(session)
+    await _to_thread(parse_dictionary, result["trans_num"])
+    await _to_thread(conv_dictionary_to_json, result["trans_num"])
+    return result
+
+
+async def load_diction_async(diction_num=None):
+    from .exfor_dictionary import Diction
+
+    return await _to_thread(Diction, diction_num)
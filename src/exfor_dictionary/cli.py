@@ -0,0 +1,217 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+Command line lookups for shell pipelines, the dictionary is loaded once
+and codes are streamed from stdin (or given as arguments):
+
+    cut -f3 refs.tsv | exfor-dict lookup --diction 3 --jsonl
+    exfor-dict lookup --diction 25 --field description --field unit_conversion_factor MB KEV
+    exfor-dict heads data
+    exfor-dict convert KEV MEV < energies.txt
+    exfor-dict mirror-sync --mirror /shared/exfor-trans
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+
+from .config import DICTIONARY_URL, MIRROR_PATH
+from .exceptions import DictionaryError, IncompatibleUnitsError
+from .exfor_dictionary import Diction
+
+BUFFER_SIZE = 1 << 16
+
+## distinct codes whose output line is kept for reuse
+MEMO_SIZE = 1 << 16
+
+
+def _input_lines(values):
+    if values:
+        return values
+    return sys.stdin
+
+
+def _output():
+    ## buffered utf-8 stdout, flushed once at the end
+    return open(
+        sys.stdout.fileno(), "w", encoding="utf-8", buffering=BUFFER_SIZE, closefd=False
+    )
+
+
+def _tsv(value):
+    if value is None:
+        return ""
+    return str(value).replace("\t", " ").replace("\n", " ")
+
+
+def lookup(diction, diction_num, lines, out, fields=("description",), jsonl=False):
+    codes = diction.dictionaries[str(diction_num)]["codes"]
+
+    ## the same codes repeat in bulk input, so the recent ones are formatted once
+    @functools.lru_cache(maxsize=MEMO_SIZE)
+    def render(code):
+        record = codes.get(code.replace("(", "").replace(")", "").strip())
+        if jsonl:
+            text = json.dumps(
+                {"code": code, "record": None if record is None else dict(record)}
+            )
+        else:
+            text = "\t".join(
+                [code] + [_tsv(record.get(f) if record else None) for f in fields]
+            )
+        return text + "\n"
+
+    for line in lines:
+        out.write(render(line.rstrip("\r\n")))
+
+    ## the memoised formatter, render.cache_info() tells the memo use
+    return render
+
+
+def heads(diction, role, out):
+    roles = diction.get_heading_roles()
+    for heading, heading_role in roles.items():
+        if role is None:
+            out.write("%s\t%s\n" % (heading, heading_role))
+        elif heading_role == role:
+            out.write(heading + "\n")
+
+
+def convert(diction, from_unit, to_unit, lines, out):
+    factor = diction.get_conversion_factor(from_unit, to_unit)
+    for n, line in enumerate(lines, 1):
+        value = line.strip()
+        if not value:
+            out.write("\n")
+            continue
+        try:
+            out.write(repr(float(value) * factor) + "\n")
+        except ValueError:
+            raise ValueError("line %d: %r is not a number" % (n, value))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="exfor-dict", description="EXFOR dictionary lookups"
+    )
+    sub = parser.add_subparsers(dest="command")
+    sub.required = True
+
+    ## --compact is also accepted after the subcommand
+    loading = argparse.ArgumentParser(add_help=False)
+    loading.add_argument(
+        "--compact",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="load with compact code records",
+    )
+
+    p = sub.add_parser("lookup", parents=[loading], help="resolve codes of one DICTION")
+    p.add_argument("--diction", required=True, help="DICTION number, e.g. 3")
+    p.add_argument("--jsonl", action="store_true", help="full records as JSON lines")
+    p.add_argument(
+        "--field",
+        action="append",
+        help="TSV column after the code, may be repeated (default: description)",
+    )
+    p.add_argument("codes", nargs="*", help="codes, read from stdin when omitted")
+
+    p = sub.add_parser(
+        "heads", parents=[loading], help="DICTION 24 headings and their roles"
+    )
+    p.add_argument("role", nargs="?", help="e.g. data, incident_en, angle")
+
+    p = sub.add_parser(
+        "convert", parents=[loading], help="convert values between DICTION 25 units"
+    )
+    p.add_argument("from_unit")
+    p.add_argument("to_unit")
+    p.add_argument("values", nargs="*", help="values, read from stdin when omitted")
+
+    p = sub.add_parser(
+        "mirror-sync", help="copy new trans files from the source into the mirror"
+    )
+    p.add_argument("--mirror", default=MIRROR_PATH, help="default: $EXFOR_MIRROR_PATH")
+    p.add_argument("--source", default=DICTIONARY_URL, help="default: $EXFOR_DICTIONARY_URL")
+    p.add_argument(
+        "--verify", action="store_true", help="also check the sha256 of mirrored files"
+    )
+
+    parser.add_argument(
+        "--compact", action="store_true", help="load with compact code records"
+    )
+    return parser
+
+
+def mirror_sync(mirror, source, verify, out):
+    from .mirror import sync
+
+    if not source.endswith("/"):
+        source += "/"
+    result = sync(mirror, source, verify=verify)
+    for status in ("added", "repaired"):
+        for trans_num in result[status]:
+            out.write("%s\ttrans.%s\n" % (status, trans_num))
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "mirror-sync":
+        if not args.mirror:
+            parser.error("set --mirror or EXFOR_MIRROR_PATH")
+        try:
+            mirror_sync(args.mirror, args.source, args.verify, sys.stdout)
+        except DictionaryError as e:
+            print("exfor-dict: %s" % e, file=sys.stderr)
+            return 1
+        return 0
+
+    diction = Diction(compact=args.compact)
+    out = _output()
+
+    try:
+        if args.command == "lookup":
+            if str(args.diction) not in diction.dictionaries:
+                parser.error("unknown DICTION %s" % args.diction)
+            lookup(
+                diction,
+                args.diction,
+                _input_lines(args.codes),
+                out,
+                fields=args.field or ("description",),
+                jsonl=args.jsonl,
+            )
+        elif args.command == "heads":
+            heads(diction, args.role, out)
+        elif args.command == "convert":
+            convert(
+                diction, args.from_unit, args.to_unit, _input_lines(args.values), out
+            )
+        out.flush()
+    except (IncompatibleUnitsError, KeyError, ValueError) as e:
+        out.flush()
+        print("exfor-dict: %s" % e, file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        ## e.g. piped into head, stop quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
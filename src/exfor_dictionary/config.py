@@ -12,19 +12,50 @@
 import os
 
 # DICTIONARY_URL = "https://nds.iaea.org/nrdc/ndsx4/trans/dictionaries/"
-DICTIONARY_URL = "https://nds.iaea.org/nrdc/ndsx4/trans/dicts/"
+## source of the trans files: the IAEA-NDS listing, a local HTTP mirror or a file:// directory
+DICTIONARY_URL = os.environ.get(
+    "EXFOR_DICTIONARY_URL", "https://nds.iaea.org/nrdc/ndsx4/trans/dicts/"
+)
+if not DICTIONARY_URL.endswith("/"):
+    DICTIONARY_URL += "/"
 
 
 if os.path.exists("src/exfor_dictionary/trans_backup") and os.path.exists("src/exfor_dictionary/trans_json") :
     DICTIONARY_PATH = "src/exfor_dictionary/"
 
 else:
-    from importlib.resources import files
-    DICTIONARY_PATH = files("exfor_dictionary")
+    ## installed package, same as importlib.resources.files() without importing it
+    DICTIONARY_PATH = os.path.dirname(os.path.abspath(__file__))
 
 
 
 PICKLE_PATH = os.path.join(DICTIONARY_PATH, "pickles")
 
+## content-addressed copy of the trans files shared by the hosts (see mirror.py),
+## when set the update reads from it instead of DICTIONARY_URL
+MIRROR_PATH = os.environ.get("EXFOR_MIRROR_PATH") or None
+
+
+## compression of the trans files stored in trans_backup: "gz", "xz", "zst" (zstandard) or None,
+## the conversion reads any of them
+TRANS_COMPRESSION = os.environ.get("EXFOR_TRANS_COMPRESSION", "gz").strip().lower()
+if TRANS_COMPRESSION in ("", "none"):
+    TRANS_COMPRESSION = None
+elif TRANS_COMPRESSION not in ("gz", "xz", "zst"):
+    ## fail at startup rather than after a trans file has been downloaded
+    raise ValueError(
+        "EXFOR_TRANS_COMPRESSION must be gz, xz, zst or empty/none, not %r"
+        % os.environ["EXFOR_TRANS_COMPRESSION"]
+    )
+
+
+## output layout of the conversion
+## per-DICTION trans_json/dictions/Diction-N.json files (compact, rewritten only on change)
+WRITE_DICTION_JSON = os.environ.get("EXFOR_WRITE_DICTION_JSON", "0") == "1"
+## indentation of latest.json and trans_json/trans.N.json, None for compact
+JSON_INDENT = 2
+## also export trans_json/columnar/trans.N/ as "parquet" or "arrow", None to skip
+COLUMNAR_FORMAT = os.environ.get("EXFOR_COLUMNAR_FORMAT") or None
+
 
 
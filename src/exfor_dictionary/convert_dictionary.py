@@ -14,12 +14,25 @@ import glob
 import re
 import os
 import json
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-
-from .config import DICTIONARY_PATH, DICTIONARY_URL, PICKLE_PATH
+import hashlib
+import stat
+import tempfile
+import time
+
+from .config import (
+    DICTIONARY_PATH,
+    DICTIONARY_URL,
+    MIRROR_PATH,
+    PICKLE_PATH,
+    WRITE_DICTION_JSON,
+    JSON_INDENT,
+    COLUMNAR_FORMAT,
+    TRANS_COMPRESSION,
+)
 from .abbreviations import convert_abbreviations
+from .layouts import ACTIVE, LAYOUTS, PARENTHESISED, PLAIN
+from .reaction import split_quantity
+from . import metrics
 
 
 def get_local_trans_nums():
@@ -33,21 +46,40 @@ def get_local_trans_nums():
     return x
 
 
-def get_server_trans_nums():
+def parse_server_trans_nums(html):
+    ## trans numbers linked from the directory listing of DICTIONARY_URL
+    from bs4 import BeautifulSoup
+
     x = ["9000"]
-    r = requests.get(DICTIONARY_URL)
-    soup = BeautifulSoup(r.text, "html.parser")
+    soup = BeautifulSoup(html, "html.parser")
     links = soup.find_all("a", attrs={"href": re.compile(r".*trans.*")})
     for link in links:
         x += [link.get("href").split(".")[-1]]
 
-    print(x)
     # remove obstruction
-    try:
-        x.remove("9927")
-        x.remove("9928")
-    except:
-        pass
+    for obstruction in ["9927", "9928"]:
+        if obstruction in x:
+            x.remove(obstruction)
+    return x
+
+
+def get_server_trans_nums():
+    from .mirror import local_path, mirrored_trans_nums, source_trans_nums
+
+    if MIRROR_PATH:
+        ## kept up to date by "exfor-dict mirror-sync", no network access
+        x = ["9000"] + mirrored_trans_nums(MIRROR_PATH)
+
+    elif local_path(DICTIONARY_URL) is not None:
+        x = ["9000"] + source_trans_nums(DICTIONARY_URL)
+
+    else:
+        import requests
+
+        r = requests.get(DICTIONARY_URL)
+        x = parse_server_trans_nums(r.text)
+
+    print(x)
     return x
 
 
@@ -56,7 +88,18 @@ def get_latest_trans_num(x):
 
 
 def download_trans(transnum):
+    from .mirror import fetch_trans, local_path, read_source
+
     url = "".join([DICTIONARY_URL, "trans.", str(transnum)])
+
+    if MIRROR_PATH or local_path(url) is not None:
+        ## from the mirror (filled from the source on a miss) or a local source
+        content = fetch_trans(transnum) if MIRROR_PATH else read_source(url)
+        write_trans(transnum, content)
+        return
+
+    import requests
+
     print(url)
     r = requests.get(url, allow_redirects=True)
 
@@ -64,8 +107,7 @@ def download_trans(transnum):
         print("Something wrong with retrieving new dictionary from the IAEA-NDS.")
 
     else:
-        file = dict_filename(transnum)
-        open(file, "wb").write(r.content)
+        write_trans(transnum, r.content)
 
 
 def download_all_trans():
@@ -97,93 +139,230 @@ def dict_filename(latest):
     return os.path.join(DICTIONARY_PATH, "trans_backup", "trans." + str(latest))
 
 
+## suffixes of the raw trans files, in the order they are looked up
+TRANS_SUFFIXES = {None: "", "gz": ".gz", "xz": ".xz", "zst": ".zst"}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstandard is required for .zst trans files, install exfor_dictionary[zstd]"
+        )
+    return zstandard
+
+
+def trans_file(latest):
+    ## trans_backup/trans.N as stored, plain or compressed
+    base = dict_filename(latest)
+    for suffix in TRANS_SUFFIXES.values():
+        if os.path.exists(base + suffix):
+            return base + suffix
+    raise FileNotFoundError(base)
+
+
+def open_trans(latest):
+    ## the raw trans file as text, decompressed while it is read
+    file = trans_file(latest)
+    if file.endswith(".gz"):
+        import gzip
+
+        return gzip.open(file, "rt")
+
+    elif file.endswith(".xz"):
+        import lzma
+
+        return lzma.open(file, "rt")
+
+    elif file.endswith(".zst"):
+        import io
+
+        reader = _zstandard().ZstdDecompressor().stream_reader(open(file, "rb"), closefd=True)
+        return io.TextIOWrapper(reader)
+
+    return open(file)
+
+
+def write_trans(transnum, content: bytes, compression=TRANS_COMPRESSION):
+    """
+    store a downloaded trans file in trans_backup, compressed with
+    compression, return the file name
+    """
+    if compression == "gz":
+        import gzip
+
+        content = gzip.compress(content, compresslevel=9, mtime=0)
+
+    elif compression == "xz":
+        import lzma
+
+        content = lzma.compress(content)
+
+    elif compression == "zst":
+        content = _zstandard().ZstdCompressor(level=19).compress(content)
+
+    elif compression is not None:
+        raise ValueError("compression must be gz, xz, zst or None")
+
+    file = dict_filename(transnum) + TRANS_SUFFIXES[compression]
+    write_file_atomic(file, content)
+    return file
+
+
 def diction_json_file(diction_num: str):
     return os.path.join(
         DICTIONARY_PATH, "trans_json", "dictions", "Diction-" + str(diction_num) + ".json"
     )
 
 
-def write_diction_json(diction_num: str, diction_dict):
+def _file_mode(file):
+    try:
+        return stat.S_IMODE(os.stat(file).st_mode)
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_file_atomic(file, content: bytes):
+    """
+    write to a temporary file in the same directory, fsync and rename it
+    over file so that readers see either the old or the new content
+    """
+    directory = os.path.dirname(os.path.abspath(file))
+    fd, tmp = tempfile.mkstemp(
+        dir=directory, prefix="." + os.path.basename(file) + ".", suffix=".tmp"
+    )
+    try:
+        ## mkstemp creates the file 0600, keep the mode of the file being
+        ## replaced or give a new one the usual umask-based mode
+        os.fchmod(fd, _file_mode(file))
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp)
+        raise
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, file)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    if hasattr(os, "O_DIRECTORY"):
+        ## persist the rename itself
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def file_digest(file):
+    try:
+        with open(file, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def write_diction_json(diction_num: str, diction_dict) -> bool:
+    """
+    write the compact Diction-N.json unless the file already has the same
+    content, return True if it was written
+    """
     file = diction_json_file(diction_num)
-    with open(file, "w") as json_file:
-        json.dump(diction_dict, json_file, indent=2)
+    content = json.dumps(diction_dict, separators=(",", ":")).encode()
+    if file_digest(file) == hashlib.sha256(content).hexdigest():
+        return False
+    write_file_atomic(file, content)
+    return True
 
 
-def write_trans_json_file(trans_num: str, exfor_dictionary):
+def write_trans_json_file(trans_num: str, exfor_dictionary, indent=JSON_INDENT):
     file = os.path.join(DICTIONARY_PATH, "trans_json", "trans." + str(trans_num) + ".json")
     latest = os.path.join(DICTIONARY_PATH, "latest.json")
-    with open(file, "w") as json_file:
-        json.dump(exfor_dictionary, json_file, indent=2)
-    with open(latest, "w") as json_file:
-        json.dump(exfor_dictionary, json_file, indent=2)
+    pointer = os.path.join(DICTIONARY_PATH, "latest.version")
+
+    ## serialized once for both files
+    content = json.dumps(exfor_dictionary, indent=indent).encode()
+    write_file_atomic(file, content)
+    write_file_atomic(latest, content)
+
+    ## publish the version last, readers poll it to reload. The digest
+    ## changes the pointer when the same release is converted again
+    digest = hashlib.sha256(content).hexdigest()
+    write_file_atomic(pointer, ("%s %s" % (trans_num, digest)).encode())
 
 
 def get_diction_difinition(latest) -> dict:
     """
     read and store diction number and description from diction 950
     """
-    file = dict_filename(latest)
-    with open(file) as f:
-        lines = f.readlines()
     dict = {}
 
     diction_950 = False
+    decode = LAYOUTS[950].decode
 
-    for line in lines:
-        if line.startswith("DICTION"):
-            diction_num = re.split("\s{2,}", line)[1]
-            if int(diction_num) == 950:
-                diction_950 = True
-                continue
-
-        elif line.startswith("ENDDICTION") and diction_950:
-            diction_950 = False
-            break
+    with open_trans(latest) as lines:
+        for line in lines:
+            if line.startswith("DICTION"):
+                diction_num = re.split("\s{2,}", line)[1]
+                if int(diction_num) == 950:
+                    diction_950 = True
+                    continue
 
-        elif diction_950:
-            x4code = str(line[:11].rstrip().lstrip())
-            desc = line[11:66].rstrip()
-            flag = line[79:80]
+            elif line.startswith("ENDDICTION") and diction_950:
+                diction_950 = False
+                break
 
-            dict[x4code] = {
-                "description": desc,
-                "active": False if flag == "O" else True,
-            }
+            elif diction_950:
+                x4code, desc, flag = decode(line)
 
-    write_diction_json("950", dict)
+                dict[x4code.strip()] = {
+                    "description": desc.rstrip(),
+                    "active": False if flag == "O" else True,
+                }
 
     return dict
 
 
-def parse_dictionary(latest):
-    file = dict_filename(latest)
+def _write_diction_dat(diction_num, lines):
+    fname = os.path.join(
+        DICTIONARY_PATH,
+        "trans_backup/dictions",
+        "diction" + str(diction_num) + ".dat",
+    )
+    with open(fname, "w") as o:
+        o.writelines(lines)
 
-    with open(file) as f:
-        lines = f.readlines()
 
-        new = False
+def parse_dictionary(latest):
+    ## each DICTION is collected and written at once, the trans file is streamed
+    with open_trans(latest) as lines:
+        diction = None
         for line in lines:
             if line.startswith("DICTION"):
-                diction = []
-                new = True
+                ## DICTION 950 runs on past its ENDDICTION up to the next DICTION
+                if diction is not None:
+                    _write_diction_dat(diction_num, diction)
                 diction_num = re.split("\s{2,}", line)[1]
-                fname = os.path.join(
-                    DICTIONARY_PATH,
-                    "trans_backup/dictions",
-                    "diction" + str(diction_num) + ".dat",
-                )
-                o = open(fname, "w")
-                o.write(line)
+                diction = [line]
                 continue
 
             elif line.startswith("ENDDICTION") and diction_num != "950":
-                new = False
-                o.close()
+                _write_diction_dat(diction_num, diction)
+                diction = None
                 continue
 
-            elif new:
-                o.write(line)
-                diction += [line]
+            elif diction is not None:
+                diction.append(line)
+
+        if diction is not None:
+            _write_diction_dat(diction_num, diction)
 
 
 def skip_unused_lines(d):
@@ -195,11 +374,12 @@ def skip_unused_lines(d):
         return False
 
 
-def conv_dictionary_to_json(latest) -> dict:
-    ## load pickles for additional info
+def load_geodata():
     """
-    Note: these pickle are included in the main EXFOR parser reporsitory
+    geocoded institutes and countries of the pickles as
+    {code: row} and {country_code: row}
     """
+    import pandas as pd
 
     institute_df = pd.read_pickle(os.path.join(PICKLE_PATH, "institute.pickle"))
     institute_df["code"] = institute_df["code"].str.rstrip()
@@ -210,16 +390,54 @@ def conv_dictionary_to_json(latest) -> dict:
     country_df = country_df.set_index("country_code")
     country_dict = country_df.to_dict(orient="index")
 
+    return institute_dict, country_dict
+
+
+def institute_location(x4code, institute_dict, country_dict):
+    """
+    (address, latitude, longitude) of a DICTION 3 code, countries
+    (e.g. 1USAUSA) take the country coordinates without an address
+    """
+    if x4code[1:4].rstrip() == x4code[4:7]:
+        country = country_dict[x4code[0:4].rstrip()]
+        return None, country["country_lat"], country["country_lng"]
+
+    if institute_dict.get(x4code):
+        institute = institute_dict[x4code]
+        return institute["formatted_address"], institute["lat"], institute["lng"]
+
+    return None, None, None
+
+
+def conv_dictionary_to_json(
+    latest,
+    diction_files=WRITE_DICTION_JSON,
+    indent=JSON_INDENT,
+    columnar=COLUMNAR_FORMAT,
+) -> dict:
+    ## load pickles for additional info
+    """
+    Note: these pickle are included in the main EXFOR parser reporsitory
+    diction_files: also write trans_json/dictions/Diction-N.json
+    indent: indentation of latest.json and trans.N.json, None for compact
+    columnar: "parquet" or "arrow" to also export trans_json/columnar/trans.N/
+    """
+    institute_dict, country_dict = load_geodata()
+
 
     ## Get definitions of each DICTION from DICTION 950
     dictions = get_diction_difinition(latest)
+    if diction_files:
+        write_diction_json("950", dictions)
 
     ## initialize dict
     exfor_dictionary = {}
+    exfor_dictionary["trans_num"] = str(latest)
     exfor_dictionary["definitions"] = dictions
     exfor_dictionary["dictionaries"] = {}
 
     for diction_num in dictions:
+        started = time.perf_counter()
         fname = os.path.join(
             DICTIONARY_PATH,
             "trans_backup/dictions",
@@ -228,11 +446,12 @@ def conv_dictionary_to_json(latest) -> dict:
 
         with open(fname) as f:
             diction = f.read().splitlines()[1:]
+        num = int(diction_num)
 
         diction_dict = {}
         codes = {}
 
-        if int(diction_num) in [
+        if num in [
             209,
             207,
             33,
@@ -252,48 +471,38 @@ def conv_dictionary_to_json(latest) -> dict:
             3,
             2,
         ]:
+            from .abbreviations import institute_abbr
+
+            decode = LAYOUTS[5].decode if num == 5 else PARENTHESISED.decode
+            regex = re.compile(r"\((.*)\)")
             for d in diction:
                 if skip_unused_lines(d):
                     continue
 
                 if not d.startswith(" "):
-                    from .abbreviations import institute_abbr
-
-                    x4code = d[:11].rstrip()
-                    regex = r"\((.*)\)"
-                    desc = re.match(regex, d[11:66]).group(1)
+                    if num == 5:
+                        x4code, desc, flag, journal_contry = decode(d)
+                    else:
+                        x4code, desc, flag = decode(d)
+                    x4code = x4code.rstrip()
+                    desc = regex.match(desc).group(1)
                     desc = convert_abbreviations(institute_abbr, desc)
-                    flag = d[79:80]
 
-                    if int(diction_num) == 3:
+                    if num == 3:
                         ### for DICTION 3: Institute
-                        if not x4code[1:4].rstrip() == x4code[4:7]:
-                            if institute_dict.get(x4code):
-                                addr = institute_dict[x4code]["formatted_address"]
-                                lat = institute_dict[x4code]["lat"]
-                                lng = institute_dict[x4code]["lng"]
-                            else:
-                                addr = lat = lng = None
-
-                        elif x4code[1:4].rstrip() == x4code[4:7]:
-                            lat = country_dict[x4code[0:4].rstrip()]["country_lat"]
-                            lng = country_dict[x4code[0:4].rstrip()]["country_lng"]
-
-                        else:
-                            lat = lng = None
-
+                        addr, lat, lng = institute_location(
+                            x4code, institute_dict, country_dict
+                        )
                         codes[x4code] = {
                             "description": desc,
                             "latitude": lat,
                             "longitude": lng,
                             "address": addr,
-                            "active": False if flag == "O" or flag == "X" else True,
+                            "active": ACTIVE.get(flag, True),
                         }
 
-                    if int(diction_num) == 5:
+                    elif num == 5:
                         ### for DICTION   5  Journals
-                        journal_contry = d[62:66]
-
                         if country_dict.get(journal_contry):
                             codes[x4code] = {
                                 "description": desc,
@@ -301,44 +510,47 @@ def conv_dictionary_to_json(latest) -> dict:
                                 "pulished_country_name": country_dict[journal_contry][
                                     "country_name"
                                 ],
-                                "active": False if flag == "O" or flag == "X" else True,
+                                "active": ACTIVE.get(flag, True),
                             }
 
                     else:
                         codes[x4code] = {
                             "description": desc,
-                            "active": False if flag == "O" or flag == "X" else True,
+                            "active": ACTIVE.get(flag, True),
                         }
 
-        elif int(diction_num) in [144, 43, 38, 35, 34, 32, 31, 30, 6, 1]:
+        elif num in [144, 43, 38, 35, 34, 32, 31, 30, 6, 1]:
+            decode = LAYOUTS[6].decode if num == 6 else PLAIN.decode
             for d in diction:
-                skip_unused_lines(d)
                 if not d.startswith(" "):
-                    x4code = d[:11].rstrip()
-                    desc = d[11:66].rstrip()
-                    flag = d[79:80]
+                    if num == 6:
+                        x4code, desc, flag, report_inst = decode(d)
+                    else:
+                        x4code, desc, flag = decode(d)
+                    x4code = x4code.rstrip()
+                    desc = desc.rstrip()
 
-                    if int(diction_num) == 6:
+                    if num == 6:
                         ### for the DICTION   5  Reports
-                        report_inst = d[59:66]
                         if institute_dict.get(report_inst):
                             codes[x4code] = {
                                 "description": desc[:-7].rstrip(),
                                 "publisher": report_inst,
                                 "publisher_name": institute_dict[report_inst]["name"],
-                                "active": False if flag == "O" or flag == "X" else True,
+                                "active": ACTIVE.get(flag, True),
                             }
 
                     else:
                         codes[x4code] = {
                             "description": desc,
-                            "active": False if flag == "O" or flag == "X" else True,
+                            "active": ACTIVE.get(flag, True),
                         }
 
-        elif int(diction_num) == 24:
+        elif num == 24:
             ### DICTION 24: Data headings
             from .abbreviations import head_unit_abbr
 
+            decode = LAYOUTS[24].decode
             desc = []
             for d in diction[11:]:
                 x4code = ""
@@ -346,10 +558,10 @@ def conv_dictionary_to_json(latest) -> dict:
                 desc = ""
                 additional_code = ""
                 if d[0].isalpha() or d[0].isdigit():
-                    flag = d[79:80]  # obsolete flag
-                    x4code = d[:11].rstrip()
-                    desc = d[11:65].rstrip()
-                    additional_code = d[65:66].rstrip()
+                    x4code, desc, additional_code, flag = decode(d)  # flag: obsolete flag
+                    x4code = x4code.rstrip()
+                    desc = desc.rstrip()
+                    additional_code = additional_code.rstrip()
 
                     if x4code.startswith("DATA") and not "ERR" in x4code:
                         additional_code = "DATA"
@@ -366,21 +578,22 @@ def conv_dictionary_to_json(latest) -> dict:
                     codes[x4code] = {
                         "description": desc,
                         "additional_code": additional_code,
-                        "active": False if flag == "O" or flag == "X" else True,
+                        "active": ACTIVE.get(flag, True),
                     }
 
-        elif int(diction_num) == 25:
+        elif num == 25:
             ### DICTION 25: Data units
             from .abbreviations import head_unit_abbr
 
+            decode = LAYOUTS[25].decode
             desc = []
             for d in diction[1:]:
                 if d[0].isalpha() or d[0].isdigit():
-                    flag = d[79:80]  # obsolete flag
-                    x4code = d[:11].rstrip()
-                    desc = d[11:44].rstrip()
-                    additional_code = d[44:55].rstrip()
-                    factor = d[55:66].strip()
+                    x4code, desc, additional_code, factor, flag = decode(d)  # flag: obsolete flag
+                    x4code = x4code.rstrip()
+                    desc = desc.rstrip()
+                    additional_code = additional_code.rstrip()
+                    factor = factor.strip()
 
                 elif d.startswith(" " * 11):
                     continue
@@ -391,21 +604,22 @@ def conv_dictionary_to_json(latest) -> dict:
                         "description": desc,
                         "additional_code": additional_code,
                         "unit_conversion_factor": factor,
-                        "active": False if flag == "O" or flag == "X" else True,
+                        "active": ACTIVE.get(flag, True),
                     }
 
                 desc = []
 
-        elif int(diction_num) == 144:
+        elif num == 144:
             ### DICTION 114: Data libraries
             from .abbreviations import head_unit_abbr
 
+            decode = LAYOUTS[144].decode
             desc = []
             for d in diction[1:]:
                 if d[0].isalpha() or d[0].isdigit():
-                    flag = d[79:80]  # obsolete flag
-                    x4code = d[:15].rstrip()
-                    desc = d[15:66].rstrip()
+                    x4code, desc, flag = decode(d)  # flag: obsolete flag
+                    x4code = x4code.rstrip()
+                    desc = desc.rstrip()
 
                 elif d.startswith(" " * 11):
                     continue
@@ -414,23 +628,24 @@ def conv_dictionary_to_json(latest) -> dict:
                     desc = convert_abbreviations(head_unit_abbr, "".join(desc))
                     codes[x4code] = {
                         "description": desc,
-                        "active": False if flag == "O" or flag == "X" else True,
+                        "active": ACTIVE.get(flag, True),
                     }
 
                 desc = []
 
-        elif int(diction_num) == 213:
+        elif num == 213:
             ### DICTION 25: Data units
             from .abbreviations import head_unit_abbr
 
+            decode = LAYOUTS[213].decode
             desc = []
             for d in diction[1:]:
                 if d[0].isalpha() or d[0].isdigit():
-                    flag = d[79:80]  # obsolete flag
-                    x4code = d[:11].rstrip()
-                    additional_code = d[11:16].rstrip()
-                    x4code3 = d[16:20].rstrip()
-                    desc = d[20:66].rstrip()
+                    x4code, additional_code, x4code3, desc, flag = decode(d)  # flag: obsolete flag
+                    x4code = x4code.rstrip()
+                    additional_code = additional_code.rstrip()
+                    x4code3 = x4code3.rstrip()
+                    desc = desc.rstrip()
 
                 elif d.startswith(" " * 11):
                     continue
@@ -441,16 +656,15 @@ def conv_dictionary_to_json(latest) -> dict:
                         "description": desc,
                         "additional_code": additional_code,
                         "x4code3": x4code3,
-                        "active": False if flag == "O" or flag == "X" else True,
+                        "active": ACTIVE.get(flag, True),
                     }
 
                 desc = []
 
-        elif int(diction_num) == 236:
+        elif num == 236:
             """
             reaction string
-            exception for TRS,POL/DA/DA/DE,*/*/*+*,ANA, and
-            multiline of description are not implemented yet.
+            every code is also split into its SF5-SF8 components
 
             # Case 1
             ,POL/DA,,VAP      NO  (Vector analyzing power, iT(11))            3000023601237
@@ -475,44 +689,54 @@ def conv_dictionary_to_json(latest) -> dict:
 
             from .abbreviations import reaction_abbr
 
+            decode = LAYOUTS[236].decode
+            blank_code = " " * 18
             cont = False
             desc = []
             for d in diction[27:]:
                 if skip_unused_lines(d):
                     continue
 
+                code, long_code, code_add, text, line_flag = decode(d)
+                ## additional code on a line of its own, below its code
+                add_only = code == blank_code and code_add[:1] not in ("", " ")
+
                 ### get EXFOR code
                 if (
                     d[0].isalpha()
                     or d[0].isdigit()
                     or any(d.startswith(s) for s in [",", "("])
+                    or add_only
                     or not cont
                 ):
                     cont = False
-                    flag = d[79:80]  # obsolete flag
+                    flag = line_flag  # obsolete flag
 
-                    if not d.startswith(" ") and d[22] == "(":
+                    if not d.startswith(" ") and text[:1] == "(":
                         ## Case 1, 2, and 3
-                        x4code = d[:18].rstrip()
-                        additional_code = d[18:22].rstrip()
-
-                    elif " " not in d[:18] and d[22] != "(":
-                        ## Case 4, 5
-                        x4code = d[:30].rstrip()
+                        x4code = code.rstrip()
+                        additional_code = code_add.rstrip()
+
+                    elif " " not in code and text[:1] != "(":
+                        ## Case 4, 5: code only, flag and description follow
+                        x4code = long_code.rstrip()
+                        additional_code = ""
+                        desc = []
+                        cont = True
 
-                    elif d.startswith(" " * 18) and d[18] != " " and d[22] == "(":
+                    elif add_only and text[:1] == "(":
                         ## Case 4, 5
-                        additional_code = d[18:22].rstrip()
+                        additional_code = code_add.rstrip()
 
                     ## get description
-                    if d[22] == "(":
-                        desc = d[22:66].rstrip()
+                    if text[:1] == "(":
+                        desc = text.rstrip()
                         cont = True
                         if desc[-1].endswith(")"):
                             cont = False
 
                 elif d.startswith(" " * 22):
-                    desc += d[22:66].rstrip()
+                    desc += text.rstrip()
                     if not desc[-1].endswith(")"):
                         cont = True
                     elif desc[-1].endswith(")"):
@@ -527,7 +751,8 @@ def conv_dictionary_to_json(latest) -> dict:
                     codes[x4code] = {
                         "description": desc,
                         "additional_code": additional_code,
-                        "active": False if flag == "O" or flag == "X" else True,
+                        **split_quantity(x4code),
+                        "active": ACTIVE.get(flag, True),
                     }
 
                     desc = []
@@ -538,6 +763,12 @@ def conv_dictionary_to_json(latest) -> dict:
             """
             continue
 
+        metrics.observe(
+            "conversion_diction_seconds",
+            time.perf_counter() - started,
+            diction=str(diction_num),
+        )
+
         # create dictionary content
         diction_dict = {
             diction_num: {
@@ -550,10 +781,20 @@ def conv_dictionary_to_json(latest) -> dict:
             # append dictionary content to json/trans.***.json
             exfor_dictionary["dictionaries"].update(diction_dict)
 
-            # create individual diction-json files just in case, will be deleted in the future
-            write_diction_json(diction_num, diction_dict)
+            if diction_files:
+                write_diction_json(diction_num, diction_dict)
 
-    write_trans_json_file(latest, exfor_dictionary)
+    write_trans_json_file(latest, exfor_dictionary, indent=indent)
+
+    if columnar:
+        from .export import write_columnar
+
+        write_columnar(
+            exfor_dictionary,
+            os.path.join(DICTIONARY_PATH, "trans_json", "columnar", "trans." + str(latest)),
+            latest,
+            format=columnar,
+        )
 
     return exfor_dictionary
 
@@ -561,11 +802,14 @@ def conv_dictionary_to_json(latest) -> dict:
 def update_dictionary_to_latest():
     ## check the latest number of trans file in remote server and download it
     ## note that the oldest file that this parser can process is trans.9090.
-    latest = download_latest_dict()
+    with metrics.timer("update_stage_seconds", stage="download"):
+        latest = download_latest_dict()
 
     ## conversion to json
-    parse_dictionary(latest)
-    conv_dictionary_to_json(latest)
+    with metrics.timer("update_stage_seconds", stage="parse"):
+        parse_dictionary(latest)
+    with metrics.timer("update_stage_seconds", stage="convert"):
+        conv_dictionary_to_json(latest)
 
     print("Latest dictionary trans file is trans." + latest)
     return latest
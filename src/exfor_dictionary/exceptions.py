@@ -0,0 +1,48 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+
+class DictionaryError(Exception):
+    pass
+
+
+class DictionaryServerError(DictionaryError):
+    ## the IAEA-NDS server could not be reached or answered with an error
+    pass
+
+
+class TransFileNotFound(DictionaryServerError):
+    pass
+
+
+class ChecksumError(DictionaryError):
+    ## a mirrored trans file does not match its sha256
+    pass
+
+
+class DictionaryVersionError(DictionaryError):
+    ## the local trans file is newer than the latest one on the server
+    def __init__(self, local_num, remote_num):
+        super().__init__(
+            "local dictionary trans.%s is newer than trans.%s on the server"
+            % (local_num, remote_num)
+        )
+        self.local_num = local_num
+        self.remote_num = remote_num
+
+
+class IncompatibleUnitsError(DictionaryError, ValueError):
+    ## the DICTION 25 units are of different dimensions or have no conversion factor
+    def __init__(self, from_unit, to_unit):
+        super().__init__("cannot convert %s to %s" % (from_unit, to_unit))
+        self.from_unit = from_unit
+        self.to_unit = to_unit
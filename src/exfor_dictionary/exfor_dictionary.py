@@ -12,7 +12,74 @@
 
 import os
 import json
+import copy
+import hashlib
+import threading
 from .config import DICTIONARY_PATH
+from .spatial_index import InstituteIndex
+from .search_index import SearchIndex
+from .prefix_index import PrefixIndex
+from .reaction import ReactionMatcher, reaction_quantity
+from .records import compact_dictionaries
+from .relations import RelationIndex, country_of
+from .units import UnitGraph
+
+LATEST_FILE = os.path.join(DICTIONARY_PATH, "latest.json")
+VERSION_POINTER = os.path.join(DICTIONARY_PATH, "latest.version")
+
+
+def read_version_pointer():
+    """
+    signature of the published latest.json: "<trans number> <sha256>"
+    written to latest.version by the converter, or the file stat when
+    there is none
+    """
+    try:
+        with open(VERSION_POINTER) as f:
+            return f.read().strip()
+    except OSError:
+        pass
+    try:
+        st = os.stat(LATEST_FILE)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class _Loaded:
+    """
+    One loaded version: swapped as a whole so readers never see a mix.
+
+    Thread safety: lookups take self._loaded once and only read from it.
+    The dictionaries and the built indexes are not modified after they
+    are published, so the read path needs no lock, also on free-threaded
+    builds. The only writes are the once-only index builds in _get_index,
+    serialised by lock, and memo caches (resolve_table, unit factors,
+    fuzzy search expansions) where a race only computes the same value
+    twice.
+    """
+
+    __slots__ = ("dictionaries", "trans_num", "signature", "indexes", "lock")
+
+    def __init__(self, dictionaries, trans_num, signature=None):
+        self.dictionaries = dictionaries
+        self.trans_num = trans_num
+        self.signature = signature
+        self.indexes = {}
+        ## reentrant, a builder may use another index
+        self.lock = threading.RLock()
+
+
+## loaded versions shared by the Diction objects of this process, keyed by
+## (version, compact). Pinned versions are stored on first use, latest.json
+## only by preload(). Stored data is shared, treat it as read-only.
+_store = {}
+_store_lock = threading.Lock()
+
+
+def trans_json_file(version):
+    return os.path.join(DICTIONARY_PATH, "trans_json", "trans." + str(version) + ".json")
+
 
 ###################################################################
 ###
@@ -20,15 +87,165 @@ from .config import DICTIONARY_PATH
 ###
 ###################################################################
 class Diction:
-    def __init__(self, diction_num=None):
-        self.dictionaries = self.read_latest_dictionary()
+    def __init__(self, diction_num=None, compact=False, version=None):
+        ## compact: code records as slotted CodeRecord objects with interned strings
+        ## version: trans number of trans_json/trans.N.json, latest.json when None
+        self.compact = compact
+        self.version = None if version is None else str(version)
         self.diction_num = diction_num
+        self._reloader = None
+        self._loaded = self._attach()
+
+
+    def __reduce__(self):
+        """
+        pickled as a reference (version, diction_num, compact), e.g. for
+        process pool tasks; the receiving process reuses its shared copy
+        of that version or loads it once. Data assigned to .dictionaries
+        is not carried over. The shared copy is read-only: assign a
+        modified tree to .dictionaries instead of changing it in place.
+        """
+        return (_restore, (self.version, self.diction_num, self.compact, self.trans_num))
+
+
+    def __copy__(self):
+        ## a new Diction on the same loaded version, not a pickle round trip
+        new = Diction.__new__(Diction)
+        new.__dict__.update(self.__dict__)
+        new._reloader = None
+        return new
+
+
+    def __deepcopy__(self, memo):
+        ## an independent tree that is not shared through the store
+        new = self.__copy__()
+        memo[id(self)] = new
+        loaded = self._loaded
+        new._loaded = _Loaded(
+            copy.deepcopy(loaded.dictionaries, memo), loaded.trans_num, loaded.signature
+        )
+        return new
+
+
+    def _attach(self):
+        key = (self.version, self.compact)
+        loaded = _store.get(key)
+        if loaded is not None and (
+            self.version is not None or loaded.signature == read_version_pointer()
+        ):
+            return loaded
+
+        if self.version is None:
+            return self._load()
+
+        with _store_lock:
+            loaded = _store.get(key)
+            if loaded is None:
+                loaded = _store[key] = self._load()
+        return loaded
+
+
+    def _load(self):
+        if self.version is None:
+            ## take the signature first, a version published meanwhile is picked up next time
+            signature = read_version_pointer()
+            dictionaries, trans_num = self._read_latest()
+        else:
+            signature = self.version
+            dictionaries, trans_num = self._read(trans_json_file(self.version))
+            trans_num = self.version
+        if self.compact:
+            dictionaries = compact_dictionaries(dictionaries)
+        return _Loaded(dictionaries, trans_num, signature)
+
+
+    def _read(self, file):
+        with open(file, "rb") as json_file:
+            content = json_file.read()
+        exfor_dictionary = json.loads(content)
+
+        ## files converted before trans_num was recorded are identified by content
+        trans_num = exfor_dictionary.get("trans_num") or hashlib.sha1(content).hexdigest()[:12]
+        return exfor_dictionary["dictionaries"], trans_num
+
+
+    def _read_latest(self):
+        return self._read(LATEST_FILE)
 
 
     def read_latest_dictionary(self):
-        file = os.path.join(DICTIONARY_PATH, "latest.json")
-        with open(file) as json_file:
-            return json.load(json_file)["dictionaries"]
+        return self._read_latest()[0]
+
+
+    @property
+    def dictionaries(self):
+        return self._loaded.dictionaries
+
+
+    @dictionaries.setter
+    def dictionaries(self, dictionaries):
+        self._loaded = _Loaded(dictionaries, self._loaded.trans_num)
+
+
+    @property
+    def trans_num(self):
+        return self._loaded.trans_num
+
+
+    def _get_index(self, name, builder):
+        ## derived indexes are built on first use, once per loaded dictionary
+        loaded = self._loaded
+        index = loaded.indexes.get(name)
+        if index is None:
+            with loaded.lock:
+                ## another thread may have built it while we waited
+                index = loaded.indexes.get(name)
+                if index is None:
+                    index = builder(loaded.dictionaries)
+                    loaded.indexes[name] = index
+        return index
+
+
+    def reload(self, force=False):
+        """
+        load latest.json again if a new version has been published,
+        lookups keep using the current version until the swap
+        return True if a new version was loaded, always False for a
+        pinned version
+        """
+        if self.version is not None:
+            return False
+        if not force and read_version_pointer() == self._loaded.signature:
+            return False
+        self._loaded = self._load()
+        return True
+
+
+    def start_auto_reload(self, interval=5.0):
+        ## poll the version pointer from a daemon thread
+        if self._reloader is not None:
+            return
+        stop = threading.Event()
+
+        def poll():
+            while not stop.wait(interval):
+                try:
+                    self.reload()
+                except (OSError, ValueError):
+                    ## keep serving the loaded version, retry on the next tick
+                    pass
+
+        thread = threading.Thread(target=poll, name="exfor-dictionary-reload", daemon=True)
+        self._reloader = (thread, stop)
+        thread.start()
+
+
+    def stop_auto_reload(self):
+        if self._reloader is not None:
+            thread, stop = self._reloader
+            stop.set()
+            thread.join()
+            self._reloader = None
 
 
     def read_diction(self,diction):
@@ -168,6 +385,84 @@ class Diction:
         ]
 
 
+    def get_heading_roles(self):
+        ## diction 24: heading -> role, as grouped by the get_*_heads getters
+        def build(dictionaries):
+            ## the getters run on the dictionaries being indexed, not on
+            ## self._loaded, which a concurrent reload may have swapped
+            view = Diction.__new__(Diction)
+            view._loaded = _Loaded(dictionaries, None)
+            roles = {}
+            for role, getter in [
+                ("incident_en", view.get_incident_en_heads),
+                ("incident_en_err", view.get_incident_en_err_heads),
+                ("data", view.get_data_heads),
+                ("data_err", view.get_data_err_heads),
+                ("outgoing_e", view.get_outgoing_e_heads),
+                ("outgoing_e_err", view.get_outgoing_e_err_heads),
+                ("level", view.get_level_heads),
+                ("angle", view.get_angle_heads),
+                ("angle_err", view.get_angle_err_heads),
+                ("mass", view.get_mass_heads),
+                ("elem", view.get_elem_heads),
+            ]:
+                for h in getter():
+                    roles.setdefault(h, role)
+            return roles
+
+        return self._get_index("heading_roles", build)
+
+
+    def resolve_table(self, headings, units):
+        """
+        role, base unit and factor to the base unit of each column of a
+        data table, e.g.
+        resolve_table(["EN", "DATA"], ["KEV", "MB"]) ->
+            ({"heading": "EN", "unit": "KEV", "role": "incident_en",
+              "base_unit": "EV", "factor": 1000.0}, ...)
+        role is None for headings of no role, base_unit and factor are None
+        for unknown units; units without factor (ARB-UNITS, SEE TEXT) keep
+        their unit with factor 1.0 as in get_unit_factor.
+        The result is cached per (headings, units) and shared, do not modify.
+        raise ValueError if headings and units differ in length
+        """
+        key = (tuple(headings), tuple(units))
+        if len(key[0]) != len(key[1]):
+            raise ValueError(
+                "%d headings but %d units" % (len(key[0]), len(key[1]))
+            )
+        tables = self._get_index("tables", lambda dictionaries: {})
+        table = tables.get(key)
+        if table is not None:
+            return table
+
+        roles = self.get_heading_roles()
+        graph = self.get_unit_graph()
+        columns = []
+        for heading, unit in zip(*key):
+            heading = heading.strip()
+            unit = unit.strip()
+            if unit in graph.factors:
+                base_unit = graph.standard_unit(unit)
+                factor = graph.factor(unit, base_unit)
+            elif unit in graph.dimension or " " in unit:
+                base_unit, factor = unit, 1.0
+            else:
+                base_unit, factor = None, None
+            columns.append(
+                {
+                    "heading": heading,
+                    "unit": unit,
+                    "role": roles.get(heading),
+                    "base_unit": base_unit,
+                    "factor": factor,
+                }
+            )
+
+        table = tables[key] = tuple(columns)
+        return table
+
+
     def get_details(self, diction_num, key):
         diction = self.dictionaries[diction_num]["codes"]
 
@@ -194,21 +489,22 @@ class Diction:
 
 
     def get_standard_unit(self, unit):
-        diction = self.dictionaries["25"]
+        ## diction 25: unit with factor 1 of the same dimension (additional_code)
+        return self.get_unit_graph().standard_unit(unit)
 
-        additional_code = diction["codes"][unit]["additional_code"]
 
-        for unit_code in diction["codes"]:
-            if (
-                additional_code == diction["codes"][unit][additional_code]
-                and diction["codes"][unit]["unit_conversion_factor"] == 1
-            ):
-                standard_unit = unit
+    def get_unit_graph(self):
+        return self._get_index("units", UnitGraph)
+
+
+    def get_conversion_factor(self, from_unit, to_unit):
+        ## e.g. ("MB/SR", "B/SR") -> 0.001, IncompatibleUnitsError across dimensions
+        return self.get_unit_graph().factor(from_unit, to_unit)
 
-        if standard_unit == "":
-            return unit
-        else:
-            return standard_unit
+
+    def convert_units(self, values, from_unit, to_unit):
+        ## values as a numpy array in to_unit
+        return self.get_unit_graph().convert(values, from_unit, to_unit)
 
 
     def get_institute(self, code):
@@ -289,3 +585,177 @@ class Diction:
         return diction["codes"][code.replace("(", "").replace(")", "").strip()][
             "description"
         ]
+
+
+    def get_institute_index(self):
+        return self._get_index(
+            "institutes", lambda dictionaries: InstituteIndex(dictionaries["3"]["codes"])
+        )
+
+
+    def institutes_near(self, lat, lng, km):
+        ## diction 3: institutes within km of (lat, lng), nearest first
+        return self.get_institute_index().within(lat, lng, km)
+
+
+    def nearest(self, lat, lng, k=1):
+        ## diction 3: k institutes closest to (lat, lng)
+        return self.get_institute_index().nearest(lat, lng, k)
+
+
+    def get_search_index(self):
+        return self._get_index("search", SearchIndex)
+
+
+    def search(self, text, dictions=None, limit=20, active_only=True):
+        ## full-text and fuzzy search over code descriptions of all DICTIONs
+        index = self.get_search_index()
+        return index.search(text, dictions=dictions, limit=limit, active_only=active_only)
+
+
+    def get_prefix_index(self, diction_num):
+        diction_num = str(diction_num)
+        return self._get_index(
+            "prefix:" + diction_num,
+            lambda dictionaries: PrefixIndex(dictionaries[diction_num]["codes"]),
+        )
+
+
+    def complete(self, diction_num, prefix, limit=20):
+        ## codes of a DICTION starting with prefix, active codes first
+        return self.get_prefix_index(diction_num).complete(prefix, limit)
+
+
+    def get_reaction_matcher(self):
+        ## diction 236: compiled matcher of REACTION quantities (SF5-SF8)
+        return self._get_index(
+            "reaction",
+            lambda dictionaries: ReactionMatcher(
+                dictionaries["236"]["codes"], dictionaries["34"]["codes"]
+            ),
+        )
+
+
+    def classify_quantity(self, quantity):
+        ## diction 236: quantity as SF5-SF8, e.g. ",SIG,,SPA"
+        return self.get_reaction_matcher().classify(quantity)
+
+
+    def classify_reaction(self, reaction):
+        ## diction 236: quantity of a whole REACTION, e.g. "(2-HE-4(N,2N)2-HE-3,,SIG,,SPA)"
+        quantity = reaction_quantity(reaction)
+        if quantity is None:
+            return None
+        return self.get_reaction_matcher().classify(quantity)
+
+
+    def get_relations(self):
+        ## reverse indexes across DICTION 3, 5 and 6
+        return self._get_index("relations", RelationIndex)
+
+
+    def reports_by_institute(self, code):
+        ## diction 6 report series published by a diction 3 institute
+        code = code.replace("(", "").replace(")", "").strip()
+        return list(self.get_relations().reports_by_institute.get(code, []))
+
+
+    def institutes_by_country(self, country):
+        ## diction 3 institutes of a country, e.g. "1USA"
+        return list(self.get_relations().institutes_by_country.get(country.rstrip(), []))
+
+
+    def journals_by_country(self, country):
+        ## diction 5 journals published in a country, e.g. "2GER"
+        return list(self.get_relations().journals_by_country.get(country.rstrip(), []))
+
+
+    def related(self, diction_num, code):
+        """
+        codes linked to a code of diction 3, 5 or 6, e.g.
+        related("3", "1USALAS") -> {"country": "1USAUSA", "reports": [...]}
+        """
+        relations = self.get_relations()
+        diction_num = str(diction_num)
+        code = code.replace("(", "").replace(")", "").strip()
+        record = self.dictionaries[diction_num]["codes"][code]
+
+        if diction_num == "3":
+            country = country_of(code)
+            return {
+                "country": relations.countries.get(country),
+                "reports": self.reports_by_institute(code),
+                "institutes": self.institutes_by_country(country)
+                if relations.countries.get(country) == code
+                else [],
+                "journals": self.journals_by_country(country)
+                if relations.countries.get(country) == code
+                else [],
+            }
+
+        elif diction_num == "5":
+            country = (record.get("pulished_country_code") or "").rstrip()
+            return {"country": relations.countries.get(country)}
+
+        elif diction_num == "6":
+            publisher = (record.get("publisher") or "").rstrip()
+            return {
+                "publisher": publisher or None,
+                "country": relations.countries.get(country_of(publisher)) if publisher else None,
+            }
+
+        return {}
+
+
+def _restore(version, diction_num, compact, trans_num):
+    if version is None:
+        ## latest.json is shared from the first unpickled Diction on, also
+        ## with Diction() of this process, the data is read-only
+        with _store_lock:
+            loaded = _store.get((None, compact))
+            if loaded is None or loaded.signature != read_version_pointer():
+                loaded = _store[(None, compact)] = Diction(compact=compact)._loaded
+        ## the sender had another version loaded, use it if it is kept
+        if loaded.trans_num != trans_num and os.path.exists(trans_json_file(trans_num)):
+            version = trans_num
+    return Diction(diction_num, compact, version)
+
+
+## derived indexes built by preload()
+INDEXES = {
+    "heading_roles": Diction.get_heading_roles,
+    "units": Diction.get_unit_graph,
+    "relations": Diction.get_relations,
+    "reaction": Diction.get_reaction_matcher,
+    "institutes": Diction.get_institute_index,
+    "search": Diction.get_search_index,
+    "prefix": lambda d: [d.get_prefix_index(n) for n in d.dictionaries],
+}
+
+
+def preload(versions=None, indexes=None, compact=False, freeze=True):
+    """
+    load versions into the shared store and build their indexes, to be
+    called in a server master before forking workers. versions are trans
+    numbers, None stands for latest.json (the default); indexes are names
+    of INDEXES, all by default. With freeze, everything allocated so far
+    is moved out of the garbage collector (gc.freeze), so collections in
+    the workers do not write to the shared pages.
+    return the Diction of each version
+    """
+    import gc
+
+    dictions = []
+    for version in versions if versions is not None else [None]:
+        d = Diction(compact=compact, version=version)
+        if d.version is None:
+            with _store_lock:
+                _store[(None, compact)] = d._loaded
+        for name in indexes if indexes is not None else INDEXES:
+            INDEXES[name](d)
+        dictions.append(d)
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    return dictions
@@ -0,0 +1,125 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+import json
+import os
+
+## columns of the long-format table of all codes
+CODE_COLUMNS = ("version", "diction", "code", "description", "active", "extra")
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def codes_columns(dictionaries, version):
+    """
+    all codes of all DICTIONs as columns of the long-format table,
+    fields other than description/active are JSON-encoded in "extra"
+    """
+    columns = {name: [] for name in CODE_COLUMNS}
+    for diction_num, diction in dictionaries.items():
+        for code, record in diction["codes"].items():
+            extra = {k: v for k, v in record.items() if k not in ("description", "active")}
+            columns["version"].append(str(version))
+            columns["diction"].append(str(diction_num))
+            columns["code"].append(code)
+            columns["description"].append(record.get("description"))
+            columns["active"].append(record.get("active"))
+            columns["extra"].append(json.dumps(extra, sort_keys=True) if extra else None)
+    return columns
+
+
+def diction_columns(diction):
+    """
+    one DICTION as columns: code followed by every field of its records
+    """
+    fields = []
+    for record in diction["codes"].values():
+        for field in record:
+            if field not in fields:
+                fields.append(field)
+
+    columns = {"code": list(diction["codes"])}
+    for field in fields:
+        columns[field] = _column([record.get(field) for record in diction["codes"].values()])
+    return columns
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _column(values):
+    """
+    a field holding numbers (e.g. the DICTION 3 latitude/longitude, where
+    failed geocodes are stored as "") becomes a float column with None for
+    anything that is not a number, so that Arrow gets a single type
+    """
+    if not any(
+        isinstance(v, (int, float)) and not isinstance(v, bool) for v in values
+    ):
+        return values
+    return [_number(v) for v in values]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required for the columnar export, install exfor_dictionary[arrow]"
+        )
+    return pyarrow
+
+
+def _write_table(columns, file, format):
+    pa = _pyarrow()
+    table = pa.table(columns)
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, file, compression="zstd")
+    else:
+        with pa.OSFile(file, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def write_columnar(exfor_dictionary, out_dir, version, format="parquet"):
+    """
+    write codes.<ext> (long format) and diction-N.<ext> per DICTION,
+    format is "parquet" or "arrow" (Arrow IPC file)
+    return the list of written files
+    """
+    if format not in FORMATS:
+        raise ValueError("format must be one of %s" % ", ".join(FORMATS))
+    ext = FORMATS[format]
+    os.makedirs(out_dir, exist_ok=True)
+    dictionaries = exfor_dictionary.get("dictionaries", exfor_dictionary)
+
+    written = []
+    file = os.path.join(out_dir, "codes" + ext)
+    _write_table(codes_columns(dictionaries, version), file, format)
+    written.append(file)
+
+    for diction_num, diction in dictionaries.items():
+        file = os.path.join(out_dir, "diction-" + str(diction_num) + ext)
+        _write_table(diction_columns(diction), file, format)
+        written.append(file)
+
+    return written
@@ -1,10 +1,7 @@
 import os
 import re
-import pandas as pd
-import requests
 
 from .config import PICKLE_PATH
-from .geo.key import API_KEY, GEOCODING_API
 from .exfor_dictionary import Diction
 
 
@@ -17,6 +14,8 @@ def isCountry(code):
 
 
 def get_country_info():
+    import pandas as pd
+
     d = Diction("3")
     country_info = []
     # i = 0
@@ -75,6 +74,8 @@ def get_country_info():
 
 
 def get_institute_info():
+    import pandas as pd
+
     d = Diction("3")
 
     country_df = pd.read_pickle(  os.path.join(PICKLE_PATH, "country.pickle") )
@@ -139,6 +140,8 @@ def get_institute_info():
 
 def read_dict3_from_trans():
     ## not used
+    import pandas as pd
+
     dict_file = open(os.path.join("../dictionary/original/diction3.dat"), "r")
     country_info = []
     inst_info = []
@@ -237,6 +240,10 @@ def read_dict3_from_trans():
 
 
 def call_geocoding(n):
+    ## geo/key.py with the API key is not distributed with the package
+    import requests
+    from .geo.key import API_KEY, GEOCODING_API
+
     # example call: https://maps.googleapis.com/maps/api/geocode/json?address=Univ. of Alberta, Edmonton, Alberta, USA&key=API_KEY
     call = "".join([GEOCODING_API, n, "&key=", API_KEY])
 
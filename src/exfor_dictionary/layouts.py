@@ -0,0 +1,83 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+import operator
+
+## flag in column 80 -> active, "O" (obsolete) and "X" mark inactive codes
+ACTIVE = {"O": False, "X": False}
+
+
+class Layout:
+    """
+    Fixed-width columns of the records of a DICTION as (field, start, end)
+    with 0-based, end-exclusive offsets:
+
+        layout = Layout(("code", 0, 11), ("desc", 11, 66), ("flag", 79, 80))
+        code, desc, flag = layout.decode(line)
+
+    decode is one operator.itemgetter over the slices, so only these
+    columns are extracted and in a single C call. Fields may overlap;
+    short lines give short or empty fields as plain slicing does.
+    """
+
+    def __init__(self, *fields):
+        if len(fields) < 2:
+            raise ValueError("a layout needs at least two fields")
+        self.fields = tuple(name for name, _, _ in fields)
+        self.decode = operator.itemgetter(*(slice(start, end) for _, start, end in fields))
+
+
+## "(description)" in columns 12-66
+PARENTHESISED = Layout(("code", 0, 11), ("desc", 11, 66), ("flag", 79, 80))
+
+## plain description
+PLAIN = Layout(("code", 0, 11), ("desc", 11, 66), ("flag", 79, 80))
+
+LAYOUTS = {
+    ## journals, parenthesised with the country in 63-66
+    5: Layout(("code", 0, 11), ("desc", 11, 66), ("flag", 79, 80), ("country", 62, 66)),
+    ## reports, plain with the publishing institute in 60-66
+    6: Layout(("code", 0, 11), ("desc", 11, 66), ("flag", 79, 80), ("institute", 59, 66)),
+    ## data headings
+    24: Layout(
+        ("code", 0, 11), ("desc", 11, 65), ("additional_code", 65, 66), ("flag", 79, 80)
+    ),
+    ## data units
+    25: Layout(
+        ("code", 0, 11),
+        ("desc", 11, 44),
+        ("additional_code", 44, 55),
+        ("factor", 55, 66),
+        ("flag", 79, 80),
+    ),
+    ## data libraries
+    144: Layout(("code", 0, 15), ("desc", 15, 66), ("flag", 79, 80)),
+    213: Layout(
+        ("code", 0, 11),
+        ("additional_code", 11, 16),
+        ("x4code3", 16, 20),
+        ("desc", 20, 66),
+        ("flag", 79, 80),
+    ),
+    ## quantities: a code of up to 18 columns, or of up to 30 when it
+    ## stands alone on its line, and a description continued on the next
+    ## lines from column 23
+    236: Layout(
+        ("code", 0, 18),
+        ("long_code", 0, 30),
+        ("additional_code", 18, 22),
+        ("desc", 22, 66),
+        ("flag", 79, 80),
+    ),
+    ## DICTION numbers and their titles
+    950: Layout(("code", 0, 11), ("desc", 11, 66), ("flag", 79, 80)),
+}
@@ -0,0 +1,293 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+Opt-in metrics for Diction and the converter.
+
+    from exfor_dictionary import metrics
+    metrics.enable()
+    ...
+    metrics.snapshot()        # dict
+    metrics.to_prometheus()   # text exposition format
+    metrics.add_listener(lambda kind, name, labels, value: ...)
+
+While disabled the Diction methods are the plain, unwrapped functions:
+enable() wraps them and disable() puts the originals back.
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+## upper bounds of the latency histogram buckets in seconds
+BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0, float("inf"))
+
+## Diction methods timed once enabled, besides __init__
+DICTION_METHODS = (
+    "get_diction",
+    "get_incident_en_heads",
+    "get_incident_en_err_heads",
+    "get_data_heads",
+    "get_data_err_heads",
+    "get_outgoing_e_heads",
+    "get_outgoing_e_err_heads",
+    "get_level_heads",
+    "get_angle_heads",
+    "get_angle_err_heads",
+    "get_mass_heads",
+    "get_elem_heads",
+    "get_heading_roles",
+    "resolve_table",
+    "get_details",
+    "get_unit_factor",
+    "get_standard_unit",
+    "get_conversion_factor",
+    "convert_units",
+    "get_institute",
+    "get_reftype",
+    "get_journal",
+    "get_report",
+    "get_confproceeding",
+    "get_method",
+    "get_detectors",
+    "get_facility",
+    "get_err_analysis",
+    "get_inc_sources",
+    "institutes_near",
+    "nearest",
+    "search",
+    "complete",
+    "get_reaction_matcher",
+    "classify_quantity",
+    "classify_reaction",
+    "reports_by_institute",
+    "institutes_by_country",
+    "journals_by_country",
+    "related",
+    "reload",
+)
+
+_lock = threading.Lock()
+_enabled = False
+_originals = {}
+_counters = {}
+_histograms = {}
+_listeners = []
+
+
+def is_enabled():
+    return _enabled
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+
+def incr(name, value=1, **labels):
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+    for listener in _listeners:
+        listener("counter", name, labels, value)
+
+
+def observe(name, seconds, **labels):
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        h = _histograms.get(key)
+        if h is None:
+            h = _histograms[key] = {"count": 0, "sum": 0.0, "buckets": [0] * len(BUCKETS)}
+        h["count"] += 1
+        h["sum"] += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                h["buckets"][i] += 1
+                break
+    for listener in _listeners:
+        listener("histogram", name, labels, seconds)
+
+
+@contextmanager
+def timer(name, **labels):
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def add_listener(callback):
+    ## callback(kind, name, labels, value) on every recorded value
+    _listeners.append(callback)
+
+
+def remove_listener(callback):
+    _listeners.remove(callback)
+
+
+def _timed(fn, name, **labels):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            observe(name, time.perf_counter() - start, **labels)
+
+    return wrapper
+
+
+def _counted_index(fn):
+    @functools.wraps(fn)
+    def wrapper(self, name, builder):
+        hit = name in self._loaded.indexes
+        incr("diction_index_lookups_total", index=name.split(":")[0], result="hit" if hit else "miss")
+        if hit:
+            return fn(self, name, builder)
+        with timer("diction_index_build_seconds", index=name.split(":")[0]):
+            return fn(self, name, builder)
+
+    return wrapper
+
+
+def enable():
+    global _enabled
+    from .exfor_dictionary import Diction
+
+    with _lock:
+        if _enabled:
+            return
+        _originals["__init__"] = Diction.__init__
+        Diction.__init__ = _timed(Diction.__init__, "diction_load_seconds")
+        _originals["_get_index"] = Diction._get_index
+        Diction._get_index = _counted_index(Diction._get_index)
+        for method in DICTION_METHODS:
+            fn = Diction.__dict__.get(method)
+            if fn is None:
+                continue
+            _originals[method] = fn
+            setattr(Diction, method, _timed(fn, "diction_call_seconds", method=method))
+        _enabled = True
+
+
+def disable():
+    global _enabled
+    from .exfor_dictionary import Diction
+
+    with _lock:
+        for method, fn in _originals.items():
+            setattr(Diction, method, fn)
+        _originals.clear()
+        _enabled = False
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def snapshot():
+    """
+    {"counters": [{"name", "labels", "value"}],
+     "histograms": [{"name", "labels", "count", "sum", "buckets": {le: n}}]}
+    bucket counts are cumulative as in Prometheus
+    """
+    with _lock:
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(_counters.items())
+        ]
+        histograms = []
+        for (name, labels), h in sorted(_histograms.items()):
+            cumulative = 0
+            buckets = {}
+            for bound, n in zip(BUCKETS, h["buckets"]):
+                cumulative += n
+                buckets["+Inf" if bound == float("inf") else repr(bound)] = cumulative
+            histograms.append(
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": h["count"],
+                    "sum": h["sum"],
+                    "buckets": buckets,
+                }
+            )
+    return {"counters": counters, "histograms": histograms}
+
+
+def _labels(labels, **extra):
+    labels = dict(labels, **extra)
+    if not labels:
+        return ""
+    return "{%s}" % ",".join('%s="%s"' % (k, v) for k, v in sorted(labels.items()))
+
+
+def to_prometheus(prefix="exfor_dictionary_"):
+    lines = []
+    typed = set()
+    data = snapshot()
+    for c in data["counters"]:
+        name = prefix + c["name"]
+        if name not in typed:
+            lines.append("# TYPE %s counter" % name)
+            typed.add(name)
+        lines.append("%s%s %s" % (name, _labels(c["labels"]), c["value"]))
+    for h in data["histograms"]:
+        name = prefix + h["name"]
+        if name not in typed:
+            lines.append("# TYPE %s histogram" % name)
+            typed.add(name)
+        for le, n in h["buckets"].items():
+            lines.append("%s_bucket%s %d" % (name, _labels(h["labels"], le=le), n))
+        lines.append("%s_sum%s %r" % (name, _labels(h["labels"]), h["sum"]))
+        lines.append("%s_count%s %d" % (name, _labels(h["labels"]), h["count"]))
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profile(path=None, sort="cumulative", limit=30):
+    """
+    cProfile the enclosed block, e.g. a conversion run:
+
+        with metrics.profile("conversion.prof") as result:
+            conv_dictionary_to_json(latest)
+        print(result["report"])
+
+    the raw stats are dumped to path when given
+    """
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    result = {}
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        if path:
+            profiler.dump_stats(path)
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats(sort).print_stats(limit)
+        result["stats"] = stats
+        result["report"] = out.getvalue()
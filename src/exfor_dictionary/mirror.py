@@ -0,0 +1,179 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+Content-addressed mirror of the trans files, e.g. on a volume shared by
+the nodes of a cluster, so that each release is downloaded once:
+
+    <mirror>/objects/ab/abcdef...   trans file, named by its sha256
+    <mirror>/trans/trans.9128       sha256 of trans.9128
+
+One host keeps it up to date with "exfor-dict mirror-sync"; with
+EXFOR_MIRROR_PATH set, update_dictionary_to_latest reads from the mirror
+and does not go to the network.
+"""
+
+import hashlib
+import os
+import re
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+
+from .config import DICTIONARY_URL, MIRROR_PATH
+from .exceptions import ChecksumError, DictionaryServerError, TransFileNotFound
+
+TRANS_NAME = re.compile(r"^trans\.(\d+)$")
+
+## seconds to connect and between bytes of an HTTP(S) source
+HTTP_TIMEOUT = 60
+
+
+def local_path(url):
+    ## file:// URL or plain path, None for http(s)
+    parts = urlsplit(url)
+    if parts.scheme == "file":
+        return url2pathname(parts.path)
+    if parts.scheme in ("http", "https"):
+        return None
+    return url
+
+
+def read_source(url):
+    path = local_path(url)
+    if path is not None:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise TransFileNotFound("%s not found" % url)
+
+    import requests
+
+    try:
+        r = requests.get(url, allow_redirects=True, timeout=HTTP_TIMEOUT)
+    except requests.RequestException as e:
+        raise DictionaryServerError("%s: %s" % (url, e)) from e
+    if r.status_code == 404:
+        raise TransFileNotFound("%s not found on the server" % url)
+    if r.status_code >= 400:
+        raise DictionaryServerError("%s returned HTTP %d" % (url, r.status_code))
+    return r.content
+
+
+def source_trans_nums(source=DICTIONARY_URL):
+    ## trans numbers available from source
+    path = local_path(source)
+    if path is not None:
+        return sorted(
+            m.group(1) for m in (TRANS_NAME.match(f) for f in os.listdir(path)) if m
+        )
+
+    from .convert_dictionary import parse_server_trans_nums
+
+    html = read_source(source).decode("utf-8", "replace")
+    ## without the "9000" floor added for get_latest_trans_num
+    return sorted(set(parse_server_trans_nums(html)[1:]))
+
+
+def object_path(mirror, digest):
+    return os.path.join(mirror, "objects", digest[:2], digest)
+
+
+def ref_path(mirror, trans_num):
+    return os.path.join(mirror, "trans", "trans." + str(trans_num))
+
+
+def mirrored_trans_nums(mirror=MIRROR_PATH):
+    try:
+        files = os.listdir(os.path.join(mirror, "trans"))
+    except FileNotFoundError:
+        return []
+    return sorted(m.group(1) for m in (TRANS_NAME.match(f) for f in files) if m)
+
+
+def _digest(trans_num, mirror):
+    try:
+        with open(ref_path(mirror, trans_num)) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def read_trans(trans_num, mirror=MIRROR_PATH, verify=True):
+    """
+    content of trans.<trans_num> from the mirror, None if it is not mirrored
+    raise ChecksumError if verify and the content does not match
+    """
+    digest = _digest(trans_num, mirror)
+    if digest is None:
+        return None
+    try:
+        with open(object_path(mirror, digest), "rb") as f:
+            content = f.read()
+    except FileNotFoundError:
+        return None
+    if verify and hashlib.sha256(content).hexdigest() != digest:
+        raise ChecksumError("trans.%s in %s does not match its sha256" % (trans_num, mirror))
+    return content
+
+
+def add_trans(trans_num, content, mirror=MIRROR_PATH):
+    ## store content as trans.<trans_num>, the object first and the name last
+    from .convert_dictionary import file_digest, write_file_atomic
+
+    digest = hashlib.sha256(content).hexdigest()
+    file = object_path(mirror, digest)
+    ## also replaces a damaged copy
+    if file_digest(file) != digest:
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        write_file_atomic(file, content)
+    os.makedirs(os.path.dirname(ref_path(mirror, trans_num)), exist_ok=True)
+    write_file_atomic(ref_path(mirror, trans_num), digest.encode())
+    return digest
+
+
+def fetch_trans(trans_num, mirror=MIRROR_PATH, source=DICTIONARY_URL):
+    """
+    content of trans.<trans_num>, from the mirror when it holds a good copy,
+    otherwise downloaded from source once and added to the mirror
+    """
+    try:
+        content = read_trans(trans_num, mirror)
+    except ChecksumError:
+        content = None
+    if content is None:
+        content = read_source(source + "trans." + str(trans_num))
+        add_trans(trans_num, content, mirror)
+    return content
+
+
+def sync(mirror=MIRROR_PATH, source=DICTIONARY_URL, verify=False):
+    """
+    copy the trans files of source missing from the mirror, with verify
+    also check the mirrored ones and fetch those that do not match again
+    return {"added": [...], "repaired": [...]}
+    """
+    mirrored = set(mirrored_trans_nums(mirror))
+    result = {"added": [], "repaired": []}
+    for trans_num in source_trans_nums(source):
+        if trans_num in mirrored:
+            if not verify:
+                continue
+            try:
+                if read_trans(trans_num, mirror) is not None:
+                    continue
+            except ChecksumError:
+                pass
+            result["repaired"].append(trans_num)
+        else:
+            result["added"].append(trans_num)
+        add_trans(trans_num, read_source(source + "trans." + trans_num), mirror)
+    return result
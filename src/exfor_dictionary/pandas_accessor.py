@@ -0,0 +1,112 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+".exfor" accessor for pandas, registered when this module is imported:
+
+    import exfor_dictionary.pandas_accessor
+    df["inst"].exfor.describe("3")
+    df.exfor.enrich({"inst": "3", "journal": "5"})
+
+Each column is factorised, every distinct code is resolved once and the
+result is broadcast back. Unknown codes give None instead of KeyError.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .exfor_dictionary import Diction
+
+_default = []
+_default_lock = threading.Lock()
+
+
+def default_diction():
+    if not _default:
+        with _default_lock:
+            if not _default:
+                _default.append(Diction())
+    return _default[0]
+
+
+def normalize_code(value):
+    ## codes as written in EXFOR entries, e.g. "(1USALAS)"
+    if not isinstance(value, str):
+        return value
+    return value.replace("(", "").replace(")", "").strip()
+
+
+def lookup_table(diction, diction_num, field="description"):
+    ## code -> field of one DICTION, built once per loaded version
+    diction_num = str(diction_num)
+    return diction._get_index(
+        "lookup:%s:%s" % (diction_num, field),
+        lambda dictionaries: {
+            code: record.get(field)
+            for code, record in dictionaries[diction_num]["codes"].items()
+        },
+    )
+
+
+def resolve_series(series, diction_num, field="description", diction=None):
+    table = lookup_table(diction or default_diction(), diction_num, field)
+    codes, uniques = pd.factorize(series, sort=False)
+
+    ## one extra slot for missing values, which factorize codes as -1
+    resolved = np.empty(len(uniques) + 1, dtype=object)
+    resolved[:-1] = [table.get(normalize_code(u)) for u in uniques]
+    resolved[-1] = None
+    ## object dtype keeps None, pandas >= 3 would infer str and give NaN
+    return pd.Series(resolved[codes], index=series.index, name=series.name, dtype=object)
+
+
+@pd.api.extensions.register_series_accessor("exfor")
+class ExforSeriesAccessor:
+    def __init__(self, series):
+        self._obj = series
+
+
+    def describe(self, diction_num, field="description", diction=None):
+        ## field of each code of DICTION diction_num, None when unknown
+        return resolve_series(self._obj, diction_num, field, diction)
+
+
+    def active(self, diction_num, diction=None):
+        return resolve_series(self._obj, diction_num, "active", diction)
+
+
+    def is_known(self, diction_num, diction=None):
+        table = lookup_table(diction or default_diction(), diction_num)
+        codes, uniques = pd.factorize(self._obj, sort=False)
+        known = np.empty(len(uniques) + 1, dtype=bool)
+        known[:-1] = [normalize_code(u) in table for u in uniques]
+        known[-1] = False
+        return pd.Series(known[codes], index=self._obj.index, name=self._obj.name)
+
+
+@pd.api.extensions.register_dataframe_accessor("exfor")
+class ExforDataFrameAccessor:
+    def __init__(self, df):
+        self._obj = df
+
+
+    def enrich(self, columns, field="description", suffix=None, diction=None):
+        """
+        return a copy with "<column>_<field>" added for each
+        {column: diction_num} of columns
+        """
+        suffix = "_" + field if suffix is None else suffix
+        df = self._obj.copy()
+        for column, diction_num in columns.items():
+            df[column + suffix] = resolve_series(df[column], diction_num, field, diction)
+        return df
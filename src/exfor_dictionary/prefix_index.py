@@ -0,0 +1,43 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+from bisect import bisect_left
+
+
+class PrefixIndex:
+    """
+    Sorted code arrays of one DICTION for prefix completion,
+    active codes and obsolete codes kept apart.
+    """
+
+    def __init__(self, codes):
+        self.active = sorted(c for c, record in codes.items() if record["active"])
+        self.obsolete = sorted(c for c, record in codes.items() if not record["active"])
+
+
+    def complete(self, prefix, limit=20):
+        """
+        return up to limit codes starting with prefix, active codes first
+        """
+        found = _scan(self.active, prefix, limit)
+        if len(found) < limit:
+            found += _scan(self.obsolete, prefix, limit - len(found))
+        return found
+
+
+def _scan(codes, prefix, limit):
+    found = []
+    i = bisect_left(codes, prefix)
+    while i < len(codes) and len(found) < limit and codes[i].startswith(prefix):
+        found.append(codes[i])
+        i += 1
+    return found
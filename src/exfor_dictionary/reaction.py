@@ -0,0 +1,197 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+import re
+
+SUBFIELDS = ("sf5", "sf6", "sf7", "sf8")
+
+## "*" in SF7 of DICTION 236 stands for any particle code
+WILDCARD_REGEX = r"[^,/+]+?"
+
+
+def split_quantity(code):
+    """
+    split a DICTION 236 code or a REACTION quantity into SF5-SF8
+    e.g. ",POL/DA/DA/DE,*/*/*,ANA" -> {"sf5": "", "sf6": "POL/DA/DA/DE", ...}
+    """
+    fields = code.split(",", 3)
+    fields += [""] * (4 - len(fields))
+    return dict(zip(SUBFIELDS, fields))
+
+
+def normalize_quantity(quantity):
+    ## trailing empty subfields are omitted in DICTION 236
+    return quantity.strip().rstrip(",")
+
+
+def _unwrap(reaction):
+    ## drop the parentheses around the whole string, if they match each other
+    reaction = reaction.strip()
+    if not (reaction.startswith("(") and reaction.endswith(")")):
+        return reaction
+    depth = 0
+    for i, c in enumerate(reaction):
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0 and i < len(reaction) - 1:
+                return reaction
+    return reaction[1:-1]
+
+
+def split_reaction(reaction):
+    """
+    split a REACTION combination into its single reactions, e.g.
+    "((92-U-235(N,F),,SIG)/(94-PU-239(N,F),,SIG))"
+    -> ["(92-U-235(N,F),,SIG)", "(94-PU-239(N,F),,SIG)"]
+    the reactions of a combination are parenthesised and joined by
+    / * + - or =, a single reaction gives a list of itself
+    """
+    inner = _unwrap(reaction)
+    if not inner.startswith("("):
+        return [reaction.strip()]
+
+    reactions = []
+    depth = 0
+    for i, c in enumerate(inner):
+        if c == "(":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                reactions += split_reaction(inner[start : i + 1])
+    return reactions
+
+
+def reaction_quantity(reaction):
+    """
+    extract the SF5-SF8 quantity from a single REACTION string
+    e.g. "(2-HE-4(N,2N)2-HE-3,,SIG,,SPA)" -> ",SIG,,SPA"
+    None for a combination, see split_reaction
+    """
+    reaction = _unwrap(reaction)
+    if reaction.startswith("("):
+        return None
+
+    start = reaction.find("(")
+    end = reaction.find(")", start)
+    if start < 0 or end < 0:
+        return None
+
+    ## [SF4, SF5, SF6, SF7, SF8, SF9]
+    fields = reaction[end + 1 :].split(",")
+    if len(fields) < 3:
+        return None
+    return normalize_quantity(",".join(fields[1:5]))
+
+
+def _sf7_pattern(sf7):
+    return "".join(
+        WILDCARD_REGEX if c == "*" else re.escape(c) for c in sf7
+    )
+
+
+class ReactionMatcher:
+    """
+    Compiled matcher over the DICTION 236 quantities.
+
+    Codes are bucketed by (SF5, SF6, SF8); SF7 is looked up exactly and,
+    failing that, through one alternation regex per bucket for the wildcard
+    entries, so a quantity is resolved with a single pass over its length.
+    SF8 modifiers that never define a DICTION 236 quantity (e.g. SPA) are
+    treated as free modifiers and must be DICTION 34 codes.
+    """
+
+    def __init__(self, codes, modifiers=None):
+        self.codes = codes
+        self.modifiers = set(modifiers or ())
+        self.buckets = {}
+        quantity_modifiers = set()
+
+        wildcards = {}
+        for code in codes:
+            sf = split_quantity(code)
+            key = (sf["sf5"], sf["sf6"], sf["sf8"])
+            exact, _ = self.buckets.setdefault(key, ({}, None))
+            if "*" in sf["sf7"]:
+                wildcards.setdefault(key, []).append((sf["sf7"], code))
+            else:
+                exact[sf["sf7"]] = code
+            if sf["sf8"]:
+                quantity_modifiers.update(sf["sf8"].split("/"))
+
+        for key, entries in wildcards.items():
+            ## one named group per entry, most specific (longest) pattern first
+            entries.sort(key=lambda e: -len(e[0]))
+            regex = re.compile(
+                "|".join(
+                    "(?P<g%d>%s)" % (i, _sf7_pattern(sf7))
+                    for i, (sf7, _) in enumerate(entries)
+                )
+            )
+            self.buckets[key] = (
+                self.buckets[key][0],
+                (regex, [code for _, code in entries]),
+            )
+
+        self.quantity_modifiers = quantity_modifiers
+
+
+    def _lookup(self, sf5, sf6, sf7, sf8):
+        bucket = self.buckets.get((sf5, sf6, sf8))
+        if bucket is None:
+            return None
+        exact, wildcard = bucket
+        code = exact.get(sf7)
+        if code is None and wildcard is not None and sf7:
+            regex, group_codes = wildcard
+            m = regex.fullmatch(sf7)
+            if m:
+                code = group_codes[int(m.lastgroup[1:])]
+        return code
+
+
+    def match(self, quantity):
+        """
+        return the DICTION 236 code matching a SF5-SF8 quantity or None
+        """
+        sf = split_quantity(normalize_quantity(quantity))
+        code = self._lookup(sf["sf5"], sf["sf6"], sf["sf7"], sf["sf8"])
+        if code is not None or not sf["sf8"]:
+            return code
+
+        ## retry with the free SF8 modifiers taken out
+        tokens = sf["sf8"].split("/")
+        kept = [t for t in tokens if t in self.quantity_modifiers]
+        free = [t for t in tokens if t not in self.quantity_modifiers]
+        if not free or (self.modifiers and not all(t in self.modifiers for t in free)):
+            return None
+        return self._lookup(sf["sf5"], sf["sf6"], sf["sf7"], "/".join(kept))
+
+
+    def classify(self, quantity):
+        """
+        return {"code", "additional_code", "description", "active"} or None
+        """
+        code = self.match(quantity)
+        if code is None:
+            return None
+        record = self.codes[code]
+        return {
+            "code": code,
+            "additional_code": record.get("additional_code"),
+            "description": record.get("description"),
+            "active": record.get("active"),
+        }
@@ -0,0 +1,110 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+import sys
+from collections.abc import Mapping
+
+
+class CodeRecord(Mapping):
+    """
+    Immutable, slotted replacement for the per-code dicts of latest.json.
+    Records with the same fields share one schema (field -> position) and
+    keep their values in a tuple, with repeated strings interned.
+    Reads like the original dict: record["description"], .get(), .items().
+    """
+
+    __slots__ = ("_schema", "_values")
+
+    def __init__(self, schema, values):
+        object.__setattr__(self, "_schema", schema)
+        object.__setattr__(self, "_values", values)
+
+
+    def __getitem__(self, key):
+        return self._values[self._schema[key]]
+
+
+    def __iter__(self):
+        return iter(self._schema)
+
+
+    def __len__(self):
+        return len(self._values)
+
+
+    def __contains__(self, key):
+        return key in self._schema
+
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CodeRecord is immutable")
+
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+
+    __hash__ = None
+
+
+    def __repr__(self):
+        return "CodeRecord(%r)" % dict(self.items())
+
+
+    def __reduce__(self):
+        return (_from_items, (tuple(self.items()),))
+
+
+## schema per field tuple, shared by every record with those fields
+_schemas = {}
+
+
+def _schema(fields):
+    schema = _schemas.get(fields)
+    if schema is None:
+        schema = _schemas[fields] = {
+            sys.intern(f): i for i, f in enumerate(fields)
+        }
+    return schema
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _from_items(items):
+    return CodeRecord(
+        _schema(tuple(k for k, _ in items)), tuple(_intern(v) for _, v in items)
+    )
+
+
+def compact_record(record):
+    return CodeRecord(
+        _schema(tuple(record)), tuple(_intern(v) for v in record.values())
+    )
+
+
+def compact_dictionaries(dictionaries):
+    """
+    return a copy of the "dictionaries" tree with every code record as
+    a CodeRecord and the codes interned
+    """
+    compacted = {}
+    for diction_num, diction in dictionaries.items():
+        compacted[diction_num] = dict(diction)
+        compacted[diction_num]["codes"] = {
+            sys.intern(code): compact_record(record)
+            for code, record in diction["codes"].items()
+        }
+    return compacted
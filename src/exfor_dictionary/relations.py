@@ -0,0 +1,50 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+
+def country_of(institute):
+    ## DICTION 3 codes start with the country, e.g. 1USALAS -> 1USA, 2FR SAC -> 2FR
+    return institute[0:4].rstrip()
+
+
+def is_country(code):
+    ## the DICTION 3 entry of a country itself, e.g. 1USAUSA, 2FR FR
+    return code[1:4].rstrip() == code[4:7]
+
+
+class RelationIndex:
+    """
+    Reverse indexes of the links recorded by the converter:
+    DICTION 6 publisher -> DICTION 3, DICTION 5 country -> DICTION 3,
+    DICTION 3 code prefix -> country.
+    """
+
+    def __init__(self, dictionaries):
+        self.countries = {}
+        self.institutes_by_country = {}
+        for code in dictionaries["3"]["codes"]:
+            if is_country(code):
+                self.countries[country_of(code)] = code
+            else:
+                self.institutes_by_country.setdefault(country_of(code), []).append(code)
+
+        self.reports_by_institute = {}
+        for code, record in dictionaries["6"]["codes"].items():
+            publisher = record.get("publisher")
+            if publisher:
+                self.reports_by_institute.setdefault(publisher.rstrip(), []).append(code)
+
+        self.journals_by_country = {}
+        for code, record in dictionaries["5"]["codes"].items():
+            country = record.get("pulished_country_code")
+            if country:
+                self.journals_by_country.setdefault(country.rstrip(), []).append(code)
@@ -0,0 +1,142 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+import math
+import re
+from collections import defaultdict
+
+TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+
+## minimum trigram similarity for a fuzzy token match
+FUZZY_THRESHOLD = 0.35
+
+
+def tokenize(text):
+    return TOKEN_REGEX.findall(text.lower())
+
+
+def trigrams(token):
+    padded = "  " + token + " "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """
+    Inverted token index over code descriptions with trigram fuzzy
+    matching of tokens, built once per loaded dictionary.
+    """
+
+    def __init__(self, dictionaries):
+        ## document: (diction_num, code, description, active)
+        self.docs = []
+        self.postings = defaultdict(set)
+
+        for diction_num, diction in dictionaries.items():
+            for code, record in diction["codes"].items():
+                desc = record.get("description") or ""
+                doc_id = len(self.docs)
+                self.docs.append((diction_num, code, desc, record.get("active", True)))
+                for token in set(tokenize(desc)) | set(tokenize(code)):
+                    self.postings[token].add(doc_id)
+
+        self.idf = {
+            token: math.log(1.0 + len(self.docs) / len(ids))
+            for token, ids in self.postings.items()
+        }
+
+        self.vocabulary_trigrams = defaultdict(set)
+        self.trigram_counts = {}
+        for token in self.postings:
+            grams = trigrams(token)
+            self.trigram_counts[token] = len(grams)
+            for gram in grams:
+                self.vocabulary_trigrams[gram].add(token)
+
+        ## fuzzy expansions are cached since curators repeat their typos
+        self.expanded = {}
+
+
+    def expand(self, token):
+        """
+        vocabulary tokens matching a query token: {token: similarity}
+        """
+        if token in self.postings:
+            return {token: 1.0}
+        if token in self.expanded:
+            return self.expanded[token]
+
+        grams = trigrams(token)
+        counts = defaultdict(int)
+        for gram in grams:
+            for candidate in self.vocabulary_trigrams.get(gram, ()):
+                counts[candidate] += 1
+
+        matches = {}
+        for candidate, shared in counts.items():
+            similarity = shared / (len(grams) + self.trigram_counts[candidate] - shared)
+            if similarity >= FUZZY_THRESHOLD:
+                matches[candidate] = similarity
+
+        if len(self.expanded) < 10000:
+            self.expanded[token] = matches
+        return matches
+
+
+    def search(self, text, dictions=None, limit=20, active_only=True):
+        """
+        return ranked [{"diction", "code", "description", "active", "score"}, ...]
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+
+        if dictions is not None:
+            dictions = {str(n) for n in dictions}
+
+        scores = defaultdict(float)
+        matched = defaultdict(int)
+        for token in dict.fromkeys(tokens):
+            hits = {}
+            for term, similarity in self.expand(token).items():
+                weight = similarity * similarity * self.idf[term]
+                for doc_id in self.postings[term]:
+                    if weight > hits.get(doc_id, 0.0):
+                        hits[doc_id] = weight
+            for doc_id, weight in hits.items():
+                scores[doc_id] += weight
+                matched[doc_id] += 1
+
+        phrase = text.strip().lower()
+        results = []
+        for doc_id, score in scores.items():
+            diction_num, code, desc, active = self.docs[doc_id]
+            if active_only and not active:
+                continue
+            if dictions is not None and diction_num not in dictions:
+                continue
+            ## documents matching every query token rank first, exact phrase next
+            if phrase in desc.lower():
+                score *= 2.0
+            results.append((matched[doc_id], score, doc_id))
+
+        results.sort(key=lambda r: (-r[0], -r[1], r[2]))
+
+        return [
+            {
+                "diction": self.docs[doc_id][0],
+                "code": self.docs[doc_id][1],
+                "description": self.docs[doc_id][2],
+                "active": self.docs[doc_id][3],
+                "score": round(score, 4),
+            }
+            for _, score, doc_id in results[:limit]
+        ]
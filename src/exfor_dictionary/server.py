@@ -0,0 +1,302 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+"""
+Local HTTP/JSON lookup service, loading the dictionary once per host.
+
+    exfor-dict-server --host 127.0.0.1 --port 8040
+
+GET  /version                                    {"trans_num": ...}
+GET  /lookup?diction=3&code=1USALAS              code record
+POST /lookup   {"diction": "3", "codes": [...]}  {"results": {code: record|null}}
+GET  /complete?diction=3&prefix=1USA&limit=20    {"codes": [...]}
+GET  /search?q=Los+Alamos&dictions=3,6&limit=20  {"results": [...]}
+POST /headings {"headings": [...]}               {"roles": {heading: role|null}}
+
+Responses carry an ETag of the loaded trans number, connections are kept
+alive, and the latest.version pointer is polled so a new conversion is
+served without a restart. Code lookups are answered on the event loop;
+the endpoints that build or scan an index run in the default executor.
+"""
+
+import argparse
+import asyncio
+import json
+from urllib.parse import parse_qs, urlsplit
+
+from .exfor_dictionary import Diction
+
+## endpoints served from the executor: the first call builds a lazy
+## index (prefix, search, heading roles) and search scans it
+OFFLOADED = {"/complete", "/search", "/headings"}
+
+## methods of each endpoint, others get 405
+METHODS = {
+    "/version": ("GET",),
+    "/lookup": ("GET", "POST"),
+    "/complete": ("GET",),
+    "/search": ("GET",),
+    "/headings": ("POST",),
+}
+
+REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class DictionaryService:
+    def __init__(self, diction=None):
+        self.diction = diction or Diction()
+
+
+    async def watch(self, interval):
+        ## reload in a worker thread, lookups keep using the loaded version meanwhile
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await loop.run_in_executor(None, self.diction.reload)
+            except (OSError, ValueError):
+                ## retry on the next tick
+                continue
+
+
+    def lookup(self, diction_num, code):
+        codes = self._codes(diction_num)
+        return codes.get(code.replace("(", "").replace(")", "").strip())
+
+
+    def _codes(self, diction_num):
+        try:
+            return self.diction.dictionaries[str(diction_num)]["codes"]
+        except KeyError:
+            raise HTTPError(404, "unknown DICTION %s" % diction_num)
+
+
+    def handle(self, method, path, query, body):
+        diction = self.diction
+        if path not in METHODS:
+            raise HTTPError(404, "no such endpoint %s" % path)
+        if method not in METHODS[path]:
+            raise HTTPError(405, "%s is not allowed on %s" % (method, path))
+
+        if path == "/version":
+            return {"trans_num": diction.trans_num}
+
+        if path == "/lookup" and method == "GET":
+            code = _param(query, "code")
+            record = self.lookup(_param(query, "diction"), code)
+            if record is None:
+                raise HTTPError(404, "unknown code %s" % code)
+            return record
+
+        if path == "/lookup" and method == "POST":
+            request = _json_body(body)
+            diction_num = request.get("diction")
+            return {
+                "results": {
+                    code: self.lookup(diction_num, code)
+                    for code in _strings(request, "codes")
+                }
+            }
+
+        if path == "/complete":
+            diction_num = _param(query, "diction")
+            self._codes(diction_num)
+            return {
+                "codes": diction.complete(
+                    diction_num,
+                    _param(query, "prefix", ""),
+                    int(_param(query, "limit", 20)),
+                )
+            }
+
+        if path == "/search":
+            dictions = _param(query, "dictions", None)
+            return {
+                "results": diction.search(
+                    _param(query, "q"),
+                    dictions=dictions.split(",") if dictions else None,
+                    limit=int(_param(query, "limit", 20)),
+                    active_only=_param(query, "active_only", "1") not in ("0", "false"),
+                )
+            }
+
+        if path == "/headings" and method == "POST":
+            roles = diction.get_heading_roles()
+            return {
+                "roles": {h: roles.get(h) for h in _strings(_json_body(body), "headings")}
+            }
+
+        raise HTTPError(404, "no such endpoint %s" % path)
+
+
+def _param(query, name, default=KeyError):
+    values = query.get(name)
+    if values:
+        return values[0]
+    if default is KeyError:
+        raise HTTPError(400, "missing parameter %s" % name)
+    return default
+
+
+def _json_body(body):
+    try:
+        request = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "request body is not JSON")
+    if not isinstance(request, dict):
+        raise HTTPError(400, "request body is not a JSON object")
+    return request
+
+
+def _strings(request, name):
+    values = request.get(name, [])
+    if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+        raise HTTPError(400, "%s must be a list of strings" % name)
+    return values
+
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, target, version = request_line.decode("latin-1").split(" ", 2)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    return method, target, version.strip(), headers, body
+
+
+def _response(status, payload, etag, keep_alive):
+    ## default=dict serializes the CodeRecord of a compact Diction
+    body = b"" if payload is None else json.dumps(payload, default=dict).encode()
+    head = [
+        "HTTP/1.1 %d %s" % (status, REASONS[status]),
+        "Content-Type: application/json",
+        "Content-Length: %d" % len(body),
+        'ETag: "%s"' % etag,
+        "Connection: %s" % ("keep-alive" if keep_alive else "close"),
+    ]
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+def make_handler(service):
+    async def handle(method, path, query, body):
+        if path in OFFLOADED:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, service.handle, method, path, query, body
+            )
+        return service.handle(method, path, query, body)
+
+    async def handle_connection(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError):
+                    break
+                if request is None:
+                    break
+
+                method, target, version, headers, body = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (
+                    version == "HTTP/1.1" or connection == "keep-alive"
+                )
+                etag = service.diction.trans_num
+                url = urlsplit(target)
+
+                if method == "GET" and headers.get("if-none-match") == '"%s"' % etag:
+                    writer.write(_response(304, None, etag, keep_alive))
+                else:
+                    try:
+                        payload = await handle(
+                            method, url.path, parse_qs(url.query), body
+                        )
+                        status = 200
+                    except HTTPError as e:
+                        payload, status = {"error": str(e)}, e.status
+                    except (KeyError, ValueError, TypeError) as e:
+                        payload, status = {"error": str(e)}, 400
+                    except Exception:
+                        ## answer instead of dropping the connection
+                        payload, status = {"error": "internal server error"}, 500
+                    writer.write(_response(status, payload, etag, keep_alive))
+
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle_connection
+
+
+async def serve(host="127.0.0.1", port=8040, reload_interval=5.0):
+    service = DictionaryService()
+    server = await asyncio.start_server(make_handler(service), host, port)
+    watcher = asyncio.ensure_future(service.watch(reload_interval))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EXFOR dictionary lookup service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8040)
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=5.0,
+        help="seconds between checks of latest.json for a new version",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.reload_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def to_unit_vector(lat, lng):
+    ## latitude/longitude in degrees to a point on the unit sphere
+    phi = math.radians(lat)
+    lam = math.radians(lng)
+    cos_phi = math.cos(phi)
+    return (cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi))
+
+
+def km_to_chord(km):
+    ## great-circle distance to the straight-line distance on the unit sphere
+    angle = min(km / EARTH_RADIUS_KM, math.pi)
+    return 2.0 * math.sin(angle / 2.0)
+
+
+def chord_to_km(chord):
+    return 2.0 * math.asin(min(chord / 2.0, 1.0)) * EARTH_RADIUS_KM
+
+
+def _coordinate(value):
+    ## the geodata pickles store failed geocoding as "" or None
+    if value is None or value == "":
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(value):
+        return None
+    return value
+
+
+class InstituteIndex:
+    """
+    k-d tree over the DICTION 3 coordinates projected on the unit sphere.
+    Chord distance is monotonic in great-circle distance, so the usual
+    Euclidean k-d tree pruning gives exact haversine results.
+    """
+
+    def __init__(self, codes):
+        points = []
+        for code, record in codes.items():
+            lat = _coordinate(record.get("latitude"))
+            lng = _coordinate(record.get("longitude"))
+            if lat is None or lng is None:
+                continue
+            points.append((to_unit_vector(lat, lng), code))
+
+        self.size = len(points)
+        self.root = self._build(points, 0)
+
+
+    def _build(self, points, depth):
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda p: p[0][axis])
+        median = len(points) // 2
+        ## node: (point, code, axis, left, right)
+        return (
+            points[median][0],
+            points[median][1],
+            axis,
+            self._build(points[:median], depth + 1),
+            self._build(points[median + 1 :], depth + 1),
+        )
+
+
+    def within(self, lat, lng, km):
+        """
+        return [(code, distance_km), ...] within km, nearest first
+        """
+        ## a negative km would square to a valid radius
+        if km < 0:
+            return []
+
+        target = to_unit_vector(lat, lng)
+        radius = km_to_chord(km)
+        radius2 = radius * radius
+        found = []
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            point, code, axis, left, right = node
+            d2 = _dist2(point, target)
+            if d2 <= radius2:
+                found.append((d2, code))
+
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append(near)
+            if diff * diff <= radius2:
+                stack.append(far)
+
+        found.sort()
+        return [(code, chord_to_km(math.sqrt(d2))) for d2, code in found]
+
+
+    def nearest(self, lat, lng, k=1):
+        """
+        return the k closest [(code, distance_km), ...], nearest first
+        """
+        if k <= 0:
+            return []
+
+        target = to_unit_vector(lat, lng)
+        ## max-heap of the best k as (-d2, code)
+        best = []
+
+        def visit(node):
+            if node is None:
+                return
+            point, code, axis, left, right = node
+            d2 = _dist2(point, target)
+            if len(best) < k:
+                heapq.heappush(best, (-d2, code))
+            elif d2 < -best[0][0]:
+                heapq.heapreplace(best, (-d2, code))
+
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(best) < k or diff * diff < -best[0][0]:
+                visit(far)
+
+        visit(self.root)
+        return [
+            (code, chord_to_km(math.sqrt(-neg_d2)))
+            for neg_d2, code in sorted(best, reverse=True)
+        ]
+
+
+def _dist2(a, b):
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    dz = a[2] - b[2]
+    return dx * dx + dy * dy + dz * dz
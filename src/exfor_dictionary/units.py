@@ -0,0 +1,120 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+from .exceptions import IncompatibleUnitsError
+
+
+def parse_factor(factor):
+    ## "1.E-3" -> 0.001, "" (e.g. ARB-UNITS) -> None
+    try:
+        return float(factor)
+    except (TypeError, ValueError):
+        return None
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "numpy is required for convert(), install exfor_dictionary[units]"
+        )
+    return numpy
+
+
+class UnitGraph:
+    """
+    DICTION 25 units grouped by dimension (additional_code). Every unit of
+    a dimension converts to every other through the factors to the common
+    base, e.g. factor("MB/SR", "B/SR") == 1e-3.
+    """
+
+    def __init__(self, dictionaries):
+        self.dimension = {}
+        self.factors = {}
+        self.units = {}
+        for unit, record in dictionaries["25"]["codes"].items():
+            dim = record.get("additional_code")
+            self.dimension[unit] = dim
+            factor = parse_factor(record.get("unit_conversion_factor"))
+            if factor is not None:
+                self.factors[unit] = factor
+                self.units.setdefault(dim, []).append(unit)
+
+        ## the unit with factor 1 of each dimension
+        self.standard = {}
+        for dim, units in self.units.items():
+            for unit in units:
+                if self.factors[unit] == 1.0:
+                    self.standard.setdefault(dim, unit)
+
+        self._cache = {}
+
+
+    def compatible(self, from_unit, to_unit):
+        return (
+            from_unit in self.factors
+            and to_unit in self.factors
+            and self.dimension[from_unit] == self.dimension[to_unit]
+        )
+
+
+    def factor(self, from_unit, to_unit):
+        ## value in from_unit * factor = value in to_unit
+        key = (from_unit, to_unit)
+        factor = self._cache.get(key)
+        if factor is not None:
+            return factor
+
+        if from_unit not in self.dimension:
+            raise KeyError(from_unit)
+        if to_unit not in self.dimension:
+            raise KeyError(to_unit)
+
+        if from_unit == to_unit:
+            factor = 1.0
+        elif self.compatible(from_unit, to_unit):
+            factor = self.factors[from_unit] / self.factors[to_unit]
+        else:
+            raise IncompatibleUnitsError(from_unit, to_unit)
+
+        self._cache[key] = factor
+        return factor
+
+
+    def standard_unit(self, unit):
+        ## unit itself when it has no factor or its dimension has no unit with factor 1
+        if unit not in self.dimension:
+            raise KeyError(unit)
+        if unit not in self.factors:
+            return unit
+        return self.standard.get(self.dimension[unit], unit)
+
+
+    def convertible_units(self, unit):
+        ## all units unit converts to, including itself
+        if unit not in self.factors:
+            return [unit] if unit in self.dimension else []
+        return list(self.units[self.dimension[unit]])
+
+
+    def convert(self, values, from_unit, to_unit):
+        """
+        values (scalar, sequence or numpy array) in to_unit as a float
+        numpy array, values is returned as an array unchanged for factor 1
+        """
+        np = _numpy()
+        factor = self.factor(from_unit, to_unit)
+        values = np.asarray(values, dtype=float)
+        if factor == 1.0:
+            return values
+        return values * factor
@@ -0,0 +1,223 @@
+####################################################################
+#
+# This file is a part of exfor-parser/dataexplorer.
+# Copyright (C) 2022 International Atomic Energy Agency (IAEA)
+#
+# Disclaimer: The code is still under developments and not ready
+#             to use. It has been made public to share the progress
+#             among collaborators.
+# Contact:    nds.contact-point@iaea.org
+#
+####################################################################
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .exfor_dictionary import Diction
+from .reaction import split_reaction
+
+## keyword -> DICTION of every code in its parentheses
+KEYWORD_DICTIONS = {
+    "INSTITUTE": "3",
+    "DETECTOR": "22",
+    "METHOD": "21",
+    "INC-SOURCE": "19",
+    "ANALYSIS": "23",
+    "ADD-RES": "20",
+    "HEADING": "24",
+    "UNIT": "25",
+}
+
+## reference type (DICTION 4) -> DICTION of the reference code
+REFERENCE_DICTIONS = {
+    "J": "5",
+    "R": "6",
+    "P": "6",
+    "X": "6",
+    "C": "7",
+    "B": "207",
+}
+
+
+def strip_code(value):
+    """
+    content of the parentheses around a keyword value, e.g.
+    "(R,INDC(NDS)-123,1990)" -> "R,INDC(NDS)-123,1990"; parentheses inside
+    codes are kept and free text after the closing one is dropped
+    """
+    value = value.strip()
+    if not value.startswith("("):
+        return value
+    depth = 0
+    for i, c in enumerate(value):
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return value[1:i].strip()
+    return value[1:].strip()
+
+
+class KeywordValidator:
+    """
+    Resolves the codes of parsed EXFOR entries against precomputed code
+    sets of every DICTION and reports unknown and obsolete codes.
+
+    An entry is a mapping of keyword to one value or a list of values as
+    they appear in the entry, e.g.
+        {"ENTRY": "14737", "INSTITUTE": "(1USALAS)",
+         "REFERENCE": ["(R,LA-1258,1951)"], "HEADING": ["EN", "DATA"],
+         "UNIT": ["MEV", "MB"], "REACTION": "(2-HE-4(N,2N)2-HE-3,,SIG,,SPA)"}
+    """
+
+    def __init__(self, diction=None):
+        if diction is None:
+            diction = Diction()
+        self.diction = diction
+        self.codes = {}
+        self.obsolete = {}
+        for diction_num, content in diction.dictionaries.items():
+            codes = content["codes"]
+            self.codes[diction_num] = frozenset(codes)
+            self.obsolete[diction_num] = frozenset(
+                c for c, record in codes.items() if not record["active"]
+            )
+        self.report_lengths = sorted({len(c) for c in self.codes["6"]}, reverse=True)
+
+
+    def _check(self, report, keyword, diction_num, code):
+        if code not in self.codes[diction_num]:
+            report["unknown"].append(
+                {"keyword": keyword, "diction": diction_num, "code": code}
+            )
+        elif code in self.obsolete[diction_num]:
+            report["obsolete"].append(
+                {"keyword": keyword, "diction": diction_num, "code": code}
+            )
+
+
+    def _report_code(self, number):
+        ## DICTION 6 codes are report series prefixes, e.g. LA- for LA-1258
+        known = self.codes["6"]
+        for length in self.report_lengths:
+            if length <= len(number) and number[:length] in known:
+                return number[:length]
+        return number
+
+
+    def _check_reference(self, report, value):
+        fields = strip_code(value).split(",")
+        reftype = fields[0].strip()
+        self._check(report, "REFERENCE", "4", reftype)
+        diction_num = REFERENCE_DICTIONS.get(reftype)
+        if diction_num is None or len(fields) < 2:
+            return
+        code = fields[1].strip()
+        if diction_num == "6":
+            code = self._report_code(code)
+        self._check(report, "REFERENCE", diction_num, code)
+
+
+    def validate_entry(self, entry):
+        """
+        return {"entry", "unknown": [...], "obsolete": [...]} for one entry
+        """
+        report = {"entry": entry.get("ENTRY"), "unknown": [], "obsolete": []}
+
+        for keyword, values in entry.items():
+            if isinstance(values, str):
+                values = [values]
+
+            if keyword in KEYWORD_DICTIONS:
+                diction_num = KEYWORD_DICTIONS[keyword]
+                for value in values:
+                    for code in strip_code(value).split(","):
+                        code = code.strip()
+                        if keyword == "UNIT" and " " in code:
+                            ## e.g. "SEE TEXT", accepted as by get_unit_factor
+                            continue
+                        if code:
+                            self._check(report, keyword, diction_num, code)
+
+            elif keyword == "REFERENCE":
+                for value in values:
+                    self._check_reference(report, value)
+
+            elif keyword == "FACILITY":
+                ## (facility, institute)
+                for value in values:
+                    fields = [f.strip() for f in strip_code(value).split(",")]
+                    self._check(report, keyword, "18", fields[0])
+                    for code in fields[1:]:
+                        self._check(report, keyword, "3", code)
+
+            elif keyword == "STATUS":
+                for value in values:
+                    self._check(report, keyword, "16", strip_code(value).split(",")[0])
+
+            elif keyword == "HISTORY":
+                ## (C970409): history code followed by a date
+                for value in values:
+                    code = strip_code(value)
+                    self._check(report, keyword, "15", code[:1])
+
+            elif keyword == "REACTION":
+                ## each reaction of a ratio or other combination separately
+                for reaction in [r for value in values for r in split_reaction(value)]:
+                    quantity = self.diction.classify_reaction(reaction)
+                    if quantity is None:
+                        report["unknown"].append(
+                            {"keyword": keyword, "diction": "236", "code": reaction}
+                        )
+                    elif not quantity["active"]:
+                        report["obsolete"].append(
+                            {"keyword": keyword, "diction": "236", "code": quantity["code"]}
+                        )
+
+        return report
+
+
+    def validate(self, entries):
+        return [self.validate_entry(entry) for entry in entries]
+
+
+## one validator per worker process, created by the pool initializer
+_worker_validator = None
+
+
+def _init_worker(diction):
+    global _worker_validator
+    _worker_validator = KeywordValidator(diction)
+
+
+def _validate_chunk(entries):
+    return _worker_validator.validate(entries)
+
+
+def validate_entries(entries, workers=None, chunksize=500, diction=None):
+    """
+    validate a batch of parsed entries, in parallel if workers > 1;
+    diction is sent to the workers as a reference to its version
+    return {"entries": [report, ...], "unknown": n, "obsolete": n}
+    """
+    entries = list(entries)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(entries) <= chunksize:
+        reports = KeywordValidator(diction).validate(entries)
+    else:
+        chunks = [entries[i : i + chunksize] for i in range(0, len(entries), chunksize)]
+        reports = []
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(diction,)
+        ) as pool:
+            for chunk_reports in pool.map(_validate_chunk, chunks):
+                reports += chunk_reports
+
+    return {
+        "entries": reports,
+        "unknown": sum(len(r["unknown"]) for r in reports),
+        "obsolete": sum(len(r["obsolete"]) for r in reports),
+    }
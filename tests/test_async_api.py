@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from exfor_dictionary import async_api, convert_dictionary, mirror
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    ## a file:// source with two releases and an empty local trans_backup
+    directory = tmp_path / "source"
+    directory.mkdir()
+    for trans_num in ("9127", "9128"):
+        (directory / ("trans." + trans_num)).write_bytes(b"trans " + trans_num.encode())
+    (tmp_path / "local" / "trans_backup").mkdir(parents=True)
+    monkeypatch.setattr(convert_dictionary, "DICTIONARY_PATH", str(tmp_path / "local"))
+    monkeypatch.setattr(async_api, "DICTIONARY_URL", directory.as_uri() + "/")
+    monkeypatch.setattr(async_api, "MIRROR_PATH", None)
+    return tmp_path
+
+
+def _stored(trans_num):
+    ## trans_backup copy, compressed as set by TRANS_COMPRESSION
+    with convert_dictionary.open_trans(trans_num) as f:
+        return f.read()
+
+
+def test_file_source(source):
+    assert asyncio.run(async_api.get_server_trans_nums_async()) == ["9000", "9127", "9128"]
+    result = asyncio.run(async_api.download_latest_dict_async())
+    assert result == {"trans_num": "9128", "downloaded": True}
+    assert _stored("9128") == "trans 9128"
+
+
+def test_mirror(source, monkeypatch):
+    mirror_path = str(source / "mirror")
+    monkeypatch.setattr(async_api, "MIRROR_PATH", mirror_path)
+    assert asyncio.run(async_api.get_server_trans_nums_async()) == ["9000"]
+
+    ## a miss is fetched from the source once and added to the mirror
+    asyncio.run(async_api.download_trans_async("9127"))
+    assert mirror.mirrored_trans_nums(mirror_path) == ["9127"]
+    assert _stored("9127") == "trans 9127"
+    assert asyncio.run(async_api.get_server_trans_nums_async()) == ["9000", "9127"]
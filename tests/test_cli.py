@@ -0,0 +1,56 @@
+import io
+import json
+
+import pytest
+
+from exfor_dictionary import cli
+from exfor_dictionary.exfor_dictionary import Diction
+
+
+@pytest.fixture(scope="module")
+def diction():
+    return Diction()
+
+
+def test_lookup_tsv(diction):
+    out = io.StringIO()
+    cli.lookup(diction, 3, ["(1USALAS)\n", "NOSUCH\n", "(1USALAS)\n"], out)
+    description = diction.get_institute("1USALAS")
+    assert out.getvalue() == "(1USALAS)\t%s\nNOSUCH\t\n(1USALAS)\t%s\n" % (
+        description,
+        description,
+    )
+
+
+def test_lookup_jsonl(diction):
+    out = io.StringIO()
+    cli.lookup(diction, "3", ["1USALAS", "NOSUCH"], out, jsonl=True)
+    first, second = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert first["record"]["description"] == diction.get_institute("1USALAS")
+    assert second == {"code": "NOSUCH", "record": None}
+
+
+def test_lookup_memo_is_bounded(diction, monkeypatch):
+    monkeypatch.setattr(cli, "MEMO_SIZE", 4)
+    out = io.StringIO()
+    codes = ["CODE%d" % n for n in range(100)]
+    render = cli.lookup(diction, "3", codes + ["1USALAS"] * 3, out)
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 103
+    assert lines[-1] == "1USALAS\t" + diction.get_institute("1USALAS")
+
+    info = render.cache_info()
+    assert info.maxsize == 4
+    assert info.currsize <= 4
+    ## the repeated code is formatted once and then served from the memo
+    assert info.hits == 2 and info.misses == 101
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [["--compact", "lookup", "--diction", "3"], ["lookup", "--compact", "--diction", "3"]],
+)
+def test_compact_before_or_after_the_subcommand(argv):
+    args = cli.build_parser().parse_args(argv)
+    assert args.compact is True
+    assert cli.build_parser().parse_args(["heads"]).compact is False
@@ -0,0 +1,30 @@
+import importlib
+
+import pytest
+
+from exfor_dictionary import config
+
+
+@pytest.fixture
+def reload_config(monkeypatch):
+    def load(value):
+        monkeypatch.setenv("EXFOR_TRANS_COMPRESSION", value)
+        return importlib.reload(config)
+
+    yield load
+    monkeypatch.undo()
+    importlib.reload(config)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("gz", "gz"), ("GZ", "gz"), (" Zst ", "zst"), ("xz", "xz"), ("", None), ("None", None)],
+)
+def test_trans_compression(reload_config, value, expected):
+    assert reload_config(value).TRANS_COMPRESSION == expected
+
+
+@pytest.mark.parametrize("value", ["gzip", "bz2", "zstd"])
+def test_trans_compression_unsupported(reload_config, value):
+    with pytest.raises(ValueError, match="EXFOR_TRANS_COMPRESSION"):
+        reload_config(value)
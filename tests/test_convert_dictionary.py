@@ -0,0 +1,53 @@
+import os
+import stat
+
+import pytest
+
+from exfor_dictionary.convert_dictionary import write_file_atomic
+
+
+def _mode(file):
+    return stat.S_IMODE(os.stat(file).st_mode)
+
+
+def test_write_file_atomic_new_file_follows_umask(tmp_path):
+    file = str(tmp_path / "latest.json")
+    umask = os.umask(0o022)
+    try:
+        write_file_atomic(file, b"{}")
+    finally:
+        os.umask(umask)
+    assert _mode(file) == 0o644
+    with open(file, "rb") as f:
+        assert f.read() == b"{}"
+
+
+def test_write_file_atomic_keeps_mode(tmp_path):
+    file = str(tmp_path / "latest.version")
+    with open(file, "w") as f:
+        f.write("9127")
+    os.chmod(file, 0o664)
+    write_file_atomic(file, b"9128")
+    assert _mode(file) == 0o664
+    assert not [f for f in os.listdir(str(tmp_path)) if f.endswith(".tmp")]
+
+
+def test_write_file_atomic_fchmod_failure(tmp_path, monkeypatch):
+    closed = []
+    close = os.close
+
+    def failing(fd, mode):
+        raise PermissionError("fchmod")
+
+    def recording(fd):
+        closed.append(fd)
+        close(fd)
+
+    monkeypatch.setattr(os, "fchmod", failing)
+    monkeypatch.setattr(os, "close", recording)
+    file = str(tmp_path / "latest.json")
+    with pytest.raises(PermissionError):
+        write_file_atomic(file, b"{}")
+    assert len(closed) == 1
+    ## neither the target nor the temporary file is left
+    assert os.listdir(str(tmp_path)) == []
@@ -0,0 +1,123 @@
+import copy
+import pickle
+import threading
+import time
+
+import pytest
+
+from exfor_dictionary import exfor_dictionary
+from exfor_dictionary.exfor_dictionary import INDEXES, Diction, _Loaded
+
+
+def test_indexes_built_once_under_concurrent_first_use():
+    d = Diction()
+    ## a fresh loaded version without any index
+    d._loaded = _Loaded(d.dictionaries, d.trans_num)
+    builds = {}
+    get_index = d._get_index
+
+    def counting(name, builder):
+        def build(dictionaries):
+            builds[name] = builds.get(name, 0) + 1
+            ## widen the window for a second build
+            time.sleep(0.01)
+            return builder(dictionaries)
+
+        return get_index(name, build)
+
+    d._get_index = counting
+    threads = 8
+    barrier = threading.Barrier(threads)
+    results = [[] for _ in range(threads)]
+
+    def worker(n):
+        barrier.wait()
+        for build in INDEXES.values():
+            results[n].append(build(d))
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    assert builds and all(n == 1 for n in builds.values()), builds
+    ## every thread got the same index objects
+    for result in results[1:]:
+        assert all(a is b for a, b in zip(result[:-1], results[0][:-1]))
+
+
+def test_heading_roles_built_from_the_indexed_version():
+    d = Diction()
+    other = {
+        "24": {
+            "codes": {
+                "EN-X": {"additional_code": "A", "active": True},
+                "DATA-X": {"additional_code": "DATA", "active": True},
+            }
+        }
+    }
+    ## the builder is handed another version than the one d has loaded,
+    ## as after a concurrent reload
+    d._get_index = lambda name, builder: builder(other)
+    roles = d.get_heading_roles()
+    assert roles == {"EN-X": "incident_en", "DATA-X": "data"}
+
+
+def test_resolve_table():
+    d = Diction()
+    en, data = d.resolve_table(["EN", "DATA"], ["KEV", "MB"])
+    assert en["role"] == "incident_en" and en["base_unit"] == "EV" and en["factor"] == 1000.0
+    assert data["role"] == "data"
+    assert d.resolve_table(["EN", "DATA"], ["KEV", "MB"]) is d.resolve_table(("EN", "DATA"), ("KEV", "MB"))
+
+
+def test_resolve_table_length_mismatch():
+    with pytest.raises(ValueError):
+        Diction().resolve_table(["EN", "DATA", "DATA-ERR"], ["KEV", "MB"])
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_deepcopy_is_independent(compact, monkeypatch):
+    monkeypatch.setattr(exfor_dictionary, "_store", {})
+    d = Diction(compact=compact)
+    clone = copy.deepcopy(d)
+    assert clone.dictionaries is not d.dictionaries
+    assert clone.dictionaries == d.dictionaries
+    assert clone.trans_num == d.trans_num and clone.compact == compact
+    ## nothing is seeded into the store of the process
+    assert exfor_dictionary._store == {}
+
+    clone.dictionaries["3"]["codes"].clear()
+    assert d.dictionaries["3"]["codes"]
+    assert Diction(compact=compact).dictionaries["3"]["codes"]
+
+
+def test_copy_shares_the_loaded_version():
+    d = Diction("3")
+    clone = copy.copy(d)
+    assert clone.dictionaries is d.dictionaries
+    assert clone.diction_num == "3"
+
+
+def test_pickle_round_trip():
+    d = Diction("3")
+    restored = pickle.loads(pickle.dumps(d))
+    assert restored.diction_num == "3"
+    assert restored.trans_num == d.trans_num
+    assert restored.get_institute("1USALAS") == d.get_institute("1USALAS")
+
+
+def test_nearest_on_the_bundled_data():
+    d = Diction()
+    ## Los Alamos
+    code, km = d.nearest(35.88, -106.30)[0]
+    assert code == "1USALAS" and km < 5
+    near = d.institutes_near(48.21, 16.37, 50)
+    assert near and all(km <= 50 for _, km in near)
+
+
+def test_institutes_near_negative_distance():
+    d = Diction()
+    assert d.institutes_near(35.88, -106.30, -10) == []
+    assert d.institutes_near(35.88, -106.30, 10)[0][0] == "1USALAS"
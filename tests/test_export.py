@@ -0,0 +1,72 @@
+import pytest
+
+from exfor_dictionary.export import codes_columns, diction_columns, write_columnar
+
+## DICTION 3 as written by the converter: geocoded institutes, countries
+## whose geocoding failed ("") and institutes without coordinates
+DICTION_3 = {
+    "codes": {
+        "1CANALA": {
+            "description": "University of Alberta, Edmonton, Alberta",
+            "latitude": 53.5232,
+            "longitude": -113.5263,
+            "address": "116 St & 85 Ave, Edmonton, AB, Canada",
+            "active": True,
+        },
+        "1CANCAN": {
+            "description": "Canada",
+            "latitude": "",
+            "longitude": "",
+            "address": None,
+            "active": True,
+        },
+        "1CANBUQ": {
+            "description": "Bishop University, Lennoxville, Quebec",
+            "latitude": None,
+            "longitude": None,
+            "address": None,
+            "active": False,
+        },
+        "2ZZZXXX": {
+            "description": "Somewhere",
+            "latitude": "45.5",
+            "longitude": 7,
+            "address": "",
+            "active": True,
+        },
+    }
+}
+
+
+def test_diction_columns_numeric_fields():
+    columns = diction_columns(DICTION_3)
+    assert columns["code"] == ["1CANALA", "1CANCAN", "1CANBUQ", "2ZZZXXX"]
+    assert columns["latitude"] == [53.5232, None, None, 45.5]
+    assert columns["longitude"] == [-113.5263, None, None, 7.0]
+    ## non-numeric fields are untouched
+    assert columns["address"][1:] == [None, None, ""]
+    assert columns["active"] == [True, True, False, True]
+
+
+def test_codes_columns_extra():
+    columns = codes_columns({"3": DICTION_3}, 9128)
+    assert columns["version"] == ["9128"] * 4
+    assert columns["diction"] == ["3"] * 4
+    assert '"latitude": ""' in columns["extra"][1]
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_write_columnar(tmp_path, format):
+    pa = pytest.importorskip("pyarrow")
+    written = write_columnar({"3": DICTION_3}, str(tmp_path), 9128, format=format)
+    assert len(written) == 2
+
+    file = written[1]
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(file)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(file)).read_all()
+    assert table.schema.field("latitude").type == pa.float64()
+    assert table.column("latitude").to_pylist() == [53.5232, None, None, 45.5]
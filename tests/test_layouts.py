@@ -0,0 +1,39 @@
+import pytest
+
+from exfor_dictionary.layouts import ACTIVE, LAYOUTS, PARENTHESISED, Layout
+
+
+def _line(*columns):
+    ## (start, text) -> an 80-column record
+    line = [" "] * 80
+    for start, text in columns:
+        line[start : start + len(text)] = text
+    return "".join(line)
+
+
+def test_parenthesised():
+    line = _line((0, "1USALAS"), (11, "(Los Alamos National Laboratory, NM)"))
+    assert PARENTHESISED.decode(line) == (
+        "1USALAS    ",
+        "(Los Alamos National Laboratory, NM)" + " " * 19,
+        " ",
+    )
+    journal = _line((0, "PR"), (11, "(Physical Review)"), (62, "1USA"), (79, "O"))
+    assert LAYOUTS[5].decode(journal)[2:] == ("O", "1USA")
+    assert not ACTIVE.get("O", True) and ACTIVE.get(" ", True)
+
+
+def test_quantity():
+    line = _line((0, ",SIG"), (18, "CS"), (22, "(Cross section)"))
+    code, long_code, additional_code, desc, flag = LAYOUTS[236].decode(line)
+    assert code.rstrip() == ",SIG"
+    assert additional_code.rstrip() == "CS"
+    assert desc.rstrip() == "(Cross section)"
+    ## short lines give short fields, as slicing does
+    assert LAYOUTS[236].decode(",SIG") == (",SIG", ",SIG", "", "", "")
+
+
+def test_layout_needs_two_fields():
+    with pytest.raises(ValueError):
+        Layout(("code", 0, 11))
+    assert LAYOUTS[25].fields == ("code", "desc", "additional_code", "factor", "flag")
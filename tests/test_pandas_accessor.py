@@ -0,0 +1,63 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from exfor_dictionary.exfor_dictionary import Diction
+from exfor_dictionary.pandas_accessor import lookup_table  # registers .exfor
+
+
+@pytest.fixture(scope="module")
+def diction():
+    return Diction()
+
+
+def _codes(diction, diction_num, active):
+    ## one code of the DICTION with the given active flag
+    for code, record in diction.dictionaries[diction_num]["codes"].items():
+        if record["active"] is active:
+            return code
+
+
+def test_describe(diction):
+    codes = diction.dictionaries["3"]["codes"]
+    series = pd.Series(["(1USALAS)", "1USALAS", None, "NOSUCH", "1USALAS"], name="inst")
+    described = series.exfor.describe("3", diction=diction)
+    expected = codes["1USALAS"]["description"]
+    assert described.tolist() == [expected, expected, None, None, expected]
+    assert described.name == "inst"
+    assert described.index.equals(series.index)
+
+
+def test_active_and_is_known(diction):
+    active = _codes(diction, "3", True)
+    obsolete = _codes(diction, "3", False)
+    series = pd.Series([active, obsolete, "NOSUCH", None], index=[10, 20, 30, 40])
+    assert series.exfor.active("3", diction=diction).tolist() == [True, False, None, None]
+    known = series.exfor.is_known("3", diction=diction)
+    assert known.tolist() == [True, True, False, False]
+    assert known.dtype == bool
+    assert known.index.tolist() == [10, 20, 30, 40]
+
+
+def test_enrich(diction):
+    journal = next(iter(diction.dictionaries["5"]["codes"]))
+    df = pd.DataFrame({"inst": ["1USALAS", "NOSUCH"], "journal": [journal, None]})
+    enriched = df.exfor.enrich({"inst": "3", "journal": "5"}, diction=diction)
+    assert list(enriched.columns) == ["inst", "journal", "inst_description", "journal_description"]
+    assert enriched["inst_description"].tolist() == [
+        diction.get_institute("1USALAS"),
+        None,
+    ]
+    assert enriched["journal_description"].tolist() == [
+        diction.dictionaries["5"]["codes"][journal]["description"],
+        None,
+    ]
+    ## the original frame is left as it is
+    assert list(df.columns) == ["inst", "journal"]
+
+    active = df.exfor.enrich({"inst": "3"}, field="active", suffix="_ok", diction=diction)
+    assert active["inst_ok"].tolist()[1] is None
+
+
+def test_lookup_table_is_built_once(diction):
+    assert lookup_table(diction, "3") is lookup_table(diction, 3)
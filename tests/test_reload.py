@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from exfor_dictionary import convert_dictionary, exfor_dictionary
+from exfor_dictionary.exfor_dictionary import Diction
+
+
+def _tree(description):
+    return {
+        "trans_num": "9128",
+        "dictionaries": {
+            "3": {"codes": {"1CANALA": {"description": description, "active": True}}}
+        },
+    }
+
+
+@pytest.fixture
+def published(tmp_path, monkeypatch):
+    os.makedirs(str(tmp_path / "trans_json"))
+    monkeypatch.setattr(convert_dictionary, "DICTIONARY_PATH", str(tmp_path))
+    monkeypatch.setattr(exfor_dictionary, "LATEST_FILE", str(tmp_path / "latest.json"))
+    monkeypatch.setattr(exfor_dictionary, "VERSION_POINTER", str(tmp_path / "latest.version"))
+    monkeypatch.setattr(exfor_dictionary, "_store", {})
+    return tmp_path
+
+
+def test_reload_same_release_converted_again(published):
+    convert_dictionary.write_trans_json_file("9128", _tree("old"))
+    d = Diction()
+    assert d.dictionaries["3"]["codes"]["1CANALA"]["description"] == "old"
+    assert not d.reload()
+
+    convert_dictionary.write_trans_json_file("9128", _tree("new"))
+    with open(str(published / "latest.version")) as f:
+        assert f.read().split()[0] == "9128"
+    assert d.reload()
+    assert d.dictionaries["3"]["codes"]["1CANALA"]["description"] == "new"
+    assert not d.reload()
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import threading
+
+from exfor_dictionary.exfor_dictionary import Diction
+from exfor_dictionary.server import DictionaryService, make_handler
+
+
+async def _request(port, method, target, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    if body is None:
+        data = b""
+    elif isinstance(body, bytes):
+        data = body
+    else:
+        data = json.dumps(body).encode()
+    writer.write(
+        (
+            "%s %s HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n"
+            % (method, target, len(data))
+        ).encode()
+        + data
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def test_requests():
+    service = DictionaryService(Diction())
+    threads = {}
+    handle = service.handle
+
+    def recording(method, path, query, body):
+        threads[path] = threading.current_thread()
+        return handle(method, path, query, body)
+
+    service.handle = recording
+
+    async def run():
+        server = await asyncio.start_server(make_handler(service), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            results = [
+                await _request(port, "GET", "/lookup?diction=3&code=1USALAS"),
+                await _request(port, "GET", "/complete?diction=3&prefix=1USALA"),
+                await _request(port, "POST", "/headings", {"headings": ["EN", "NOSUCH"]}),
+                await _request(port, "GET", "/lookup?diction=3&code=NOSUCH"),
+            ]
+        return results, threading.current_thread()
+
+    results, loop_thread = asyncio.run(run())
+    (s1, record), (s2, completed), (s3, headings), (s4, error) = results
+    assert s1 == 200 and record["description"] == "Los Alamos National Laboratory, NM"
+    assert s2 == 200 and "1USALAS" in completed["codes"]
+    assert s3 == 200 and headings["roles"] == {"EN": "incident_en", "NOSUCH": None}
+    assert s4 == 404 and "error" in error
+
+    ## lookups stay on the event loop, index endpoints go to the executor
+    assert threads["/lookup"] is loop_thread
+    assert threads["/complete"] is not loop_thread
+    assert threads["/headings"] is not loop_thread
+
+
+def _serve(service, requests):
+    ## [(method, target, body)] -> [(status, payload)]
+    async def run():
+        server = await asyncio.start_server(make_handler(service), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return [await _request(port, *request) for request in requests]
+
+    return asyncio.run(run())
+
+
+def test_bad_requests():
+    results = _serve(
+        DictionaryService(Diction()),
+        [
+            ("POST", "/lookup", [1, 2]),
+            ("POST", "/lookup", {"diction": "3", "codes": ["1USALAS", 1]}),
+            ("POST", "/lookup", {"diction": "3", "codes": "1USALAS"}),
+            ("POST", "/headings", {"headings": [None]}),
+            ("POST", "/lookup", b"not json"),
+            ("POST", "/version", None),
+            ("GET", "/headings", None),
+            ("GET", "/nosuch", None),
+        ],
+    )
+    assert [status for status, _ in results] == [400, 400, 400, 400, 400, 405, 405, 404]
+    assert all("error" in payload for _, payload in results)
+
+
+def test_unexpected_error():
+    service = DictionaryService(Diction())
+
+    def broken(method, path, query, body):
+        raise RuntimeError("boom")
+
+    service.handle = broken
+    (status, payload), = _serve(service, [("GET", "/version", None)])
+    assert status == 500
+    assert payload == {"error": "internal server error"}
@@ -0,0 +1,61 @@
+from exfor_dictionary.exfor_dictionary import Diction
+from exfor_dictionary.reaction import reaction_quantity, split_reaction
+from exfor_dictionary.validator import KeywordValidator, validate_entries
+
+RATIO = "((92-U-235(N,F),,SIG)/(94-PU-239(N,F),,SIG))"
+
+
+def test_split_reaction():
+    assert split_reaction(RATIO) == ["(92-U-235(N,F),,SIG)", "(94-PU-239(N,F),,SIG)"]
+    assert split_reaction(
+        "(((92-U-235(N,F),,SIG)+(92-U-238(N,F),,SIG))*(94-PU-239(N,F),,SIG))"
+    ) == ["(92-U-235(N,F),,SIG)", "(92-U-238(N,F),,SIG)", "(94-PU-239(N,F),,SIG)"]
+    assert split_reaction("(2-HE-4(N,2N)2-HE-3,,SIG,,SPA)") == ["(2-HE-4(N,2N)2-HE-3,,SIG,,SPA)"]
+    assert reaction_quantity(RATIO) is None
+    assert reaction_quantity("(2-HE-4(N,2N)2-HE-3,,SIG,,SPA)") == ",SIG,,SPA"
+
+
+def test_validate_entry():
+    report = KeywordValidator().validate_entry(
+        {
+            "ENTRY": "14737",
+            "INSTITUTE": "(1USALAS)",
+            "UNIT": ["MEV", "MB", "SEE TEXT"],
+            "REACTION": [RATIO, "(92-U-235(N,F),,XYZ)"],
+        }
+    )
+    assert report["entry"] == "14737"
+    assert report["unknown"] == [
+        {"keyword": "REACTION", "diction": "236", "code": "(92-U-235(N,F),,XYZ)"}
+    ]
+
+
+def test_validate_entries_workers_use_the_given_version():
+    ## 1CANSMR is in the latest dictionary but not in trans 9090
+    entries = [{"ENTRY": str(n), "INSTITUTE": "(1CANSMR)"} for n in range(4)]
+    result = validate_entries(entries, workers=2, chunksize=2, diction=Diction(version=9090))
+    assert result["unknown"] == 4
+    result = validate_entries(entries, workers=2, chunksize=2)
+    assert result["unknown"] == 0
+
+
+def test_strip_code():
+    from exfor_dictionary.validator import strip_code
+
+    assert strip_code(" (1USALAS) ") == "1USALAS"
+    assert strip_code("(R,INDC(NDS)-123,1990)") == "R,INDC(NDS)-123,1990"
+    assert strip_code("(1USALAS) Los Alamos") == "1USALAS"
+    assert strip_code("EN") == "EN"
+
+
+def test_reference_with_parentheses_in_the_report_code():
+    validator = KeywordValidator()
+    report = validator.validate_entry(
+        {
+            "ENTRY": "30001",
+            "REFERENCE": ["(R,INDC(NDS)-123,1990)", "(R,EANDC(US)-54,1965)"],
+        }
+    )
+    assert report["unknown"] == []
+    report = validator.validate_entry({"REFERENCE": "(R,INDC(XYZ)-1,1990)"})
+    assert [u["code"] for u in report["unknown"]] == ["INDC(XYZ)-1"]